@@ -69,16 +69,20 @@ class BleDataStream:
 
 
 class BleCompoundDataType:
+    # Empty slots so subclasses can define __slots__ and not carry an instance dict
+    __slots__ = ()
     data_stream_types = []
 
     def encode_values(self, *values):
         """
         :rtype: BleDataStream
         """
-        stream = BleDataStream()
+        # Collect the encoded values and join them once rather than growing the stream per value
+        parts = []
         for value, data_type in zip(values, self.data_stream_types):
-            stream.encode(data_type, value)
-        return stream
+            encoded = data_type.encode(value)
+            parts.append(encoded.value if isinstance(encoded, BleDataStream) else encoded)
+        return BleDataStream(b"".join(parts))
 
     def encode(self):
         """
@@ -86,6 +90,15 @@ class BleCompoundDataType:
         """
         raise NotImplementedError()
 
+    def encode_bytes(self):
+        """
+        Encodes the object directly to bytes, for passing to characteristic writes/notifications.
+        Types which can build their bytes without a stream override this to skip creating the stream
+
+        :rtype: bytes
+        """
+        return self.encode().value
+
     @classmethod
     def decode(cls, stream):
         """
@@ -127,11 +140,20 @@ class BleDataType:
 
 
 class DoubleNibble(BleDataType):
+    @classmethod
+    def encode_raw(cls, value):
+        """
+        Combines the two nibbles into the raw byte value without packing it
+
+        :param value: The two integers to combine, upper nibble first
+        :rtype: int
+        """
+        return ((value[0] & 0x0F) << 4) | (value[1] & 0x0F)
+
     @classmethod
     def encode(cls, value):
-        # value should be a list of two integers
-        v = ((value[0] & 0x0F) << 4) | (value[1] & 0x0F)
-        return struct.pack("<B", v)
+        # value should be a list or tuple of two integers
+        return struct.pack("<B", cls.encode_raw(value))
 
     @classmethod
     def decode(cls, stream):
@@ -155,6 +177,15 @@ class UnsignedIntegerBase(BleDataType):
         4: "i",
         8: "q"
     }
+    # Precompiled struct and the zero padding needed to decode byte counts which aren't a struct size.
+    # Set for each subclass based on its byte count and signedness
+    _struct = struct.Struct("<B")
+    _decode_padding = b""
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._struct = struct.Struct(cls._formatter())
+        cls._decode_padding = b"\x00" * (cls._decode_size() - cls.byte_count)
 
     @classmethod
     def _decode_size(cls):
@@ -167,15 +198,30 @@ class UnsignedIntegerBase(BleDataType):
 
     @classmethod
     def encode(cls, value):
-        return struct.pack(cls._formatter(), value)[:cls.byte_count]
+        if cls._decode_padding:
+            # Byte counts without a struct format are converted directly instead of packing the next size and slicing.
+            # Values which don't fit or aren't ints fall back to the packing so they are truncated or raise struct.error
+            try:
+                return value.to_bytes(cls.byte_count, "little", signed=cls.signed)
+            except (OverflowError, AttributeError):
+                return cls._struct.pack(value)[:cls.byte_count]
+        return cls._struct.pack(value)
 
     @classmethod
     def decode(cls, stream):
         """
         :type stream: BleDataStream
         """
-        value_stream = stream.take(cls.byte_count) + b"\x00" * (cls._decode_size()-cls.byte_count)
-        value = struct.unpack(cls._formatter(), value_stream)[0]
+        if not cls._decode_padding:
+            # Unpack in place at the stream's decode index instead of slicing out the bytes first
+            index = stream.decode_index
+            value = cls._struct.unpack_from(stream.value, index)[0]
+            stream.decode_index = index + cls.byte_count
+            return value
+        value_bytes = stream.take(cls.byte_count)
+        if len(value_bytes) == cls.byte_count:
+            return int.from_bytes(value_bytes, "little")
+        value = cls._struct.unpack(value_bytes + cls._decode_padding)[0]
         return value
 
     @classmethod
@@ -306,7 +352,13 @@ class SFloat(BleDataType):
         return value
 
     @classmethod
-    def encode(cls, value):
+    def encode_raw(cls, value):
+        """
+        Converts the value into its raw 16-bit SFloat representation without packing it
+
+        :type value: float
+        :rtype: int
+        """
         if math.isnan(value):
             value = cls.ReservedMantissaValues.NAN
         if value > cls._sfloat_max:
@@ -315,8 +367,11 @@ class SFloat(BleDataType):
             value = cls.ReservedMantissaValues.NEG_INFINITY
         else:
             value = cls._encode_value(value)
+        return value
 
-        return struct.pack("<H", value)
+    @classmethod
+    def encode(cls, value):
+        return struct.pack("<H", cls.encode_raw(value))
 
     @classmethod
     def decode(cls, stream):
@@ -404,6 +459,8 @@ class DayDateTime(BleCompoundDataType):
 
 
 class Bitfield(BleCompoundDataType):
+    # Subclasses may define __slots__ with their bit attribute names
+    __slots__ = ()
     bitfield_width = 8
     bitfield_enum = None
 
@@ -418,25 +475,44 @@ class Bitfield(BleCompoundDataType):
         64: Uint64,
     }
 
-    def __init__(self):
-        assert self.bitfield_width % 8 == 0
-        assert type(self.bitfield_enum), IntEnum
-        self._mapping = {enum.value: enum.name for enum in self.bitfield_enum}
-        assert max(self._mapping.keys()) < self.bitfield_width
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.bitfield_enum is None:
+            return
+
+        # The bit -> attribute mapping is fixed per class, build it once here rather than on every instantiation
+        assert cls.bitfield_width % 8 == 0
+        assert type(cls.bitfield_enum), IntEnum
+        cls._mapping = {enum.value: enum.name for enum in cls.bitfield_enum}
+        assert max(cls._mapping.keys()) < cls.bitfield_width
+        cls._sorted_bits = tuple(sorted(cls._mapping.items()))
+        cls._bit_masks = tuple((1 << bit, attr_name) for bit, attr_name in cls._sorted_bits)
+        cls._members = tuple((member, member.name) for member in cls.bitfield_enum)
+
+    def __init__(self, *flags):
+        """
+        :param flags: The members of the bitfield's enum to set. Attributes for members not provided are set to False
+        """
+        # Bit mapping is built per-class in __init_subclass__, only the attributes are set per-instance
+        flags = frozenset(flags)
+        for member, attr_name in self._members:
+            setattr(self, attr_name, member in flags)
 
     def _iter_bits(self):
-        for bit, attr_name in sorted(self._mapping.items()):
-            yield bit, attr_name
+        return iter(self._sorted_bits)
 
-    def encode(self):
-        stream = BleDataStream()
+    def to_integer_value(self):
         value = 0
-        for bit, attr_name in self._iter_bits():
-            bit_value = getattr(self, attr_name)
-            if bit_value:
-                value |= 1 << bit
-        stream.encode(self._encoder_class(), value)
-        return stream
+        for mask, attr_name in self._bit_masks:
+            if getattr(self, attr_name):
+                value |= mask
+        return value
+
+    def encode(self):
+        return BleDataStream(self.encode_bytes())
+
+    def encode_bytes(self):
+        return self._encoder_class().encode(self.to_integer_value())
 
     @classmethod
     def _encoder_class(cls):
@@ -450,8 +526,8 @@ class Bitfield(BleCompoundDataType):
     @classmethod
     def from_integer_value(cls, value):
         bitfield = cls()
-        for bit, attr_name in bitfield._iter_bits():
-            if (value & (1 << bit)) > 0:
+        for mask, attr_name in cls._bit_masks:
+            if value & mask:
                 setattr(bitfield, attr_name, True)
 
         return bitfield
@@ -70,21 +70,14 @@ class TimeAccuracy(IntEnum):
 
 
 class AdjustmentReason(ble_data_types.Bitfield):
+    """
+    Instantiated with the list of reasons for the time adjustment,
+    e.g. ``AdjustmentReason(AdjustmentReasonType.manual_time_update, AdjustmentReasonType.dst_change)``.
+    Field names match the AdjustmentReasonType enum names exactly
+    """
     bitfield_width = 8
     bitfield_enum = AdjustmentReasonType
 
-    def __init__(self, *adjustment_reasons):
-        """
-        :param adjustment_reasons: The list of reasons for the time adjustment
-        :type adjustment_reasons: AdjustmentReasonType
-        """
-        self.manual_time_update = AdjustmentReasonType.manual_time_update in adjustment_reasons
-        self.external_time_reference_update = AdjustmentReasonType.external_time_reference_update in adjustment_reasons
-        self.time_zone_change = AdjustmentReasonType.time_zone_change in adjustment_reasons
-        self.dst_change = AdjustmentReasonType.dst_change in adjustment_reasons
-
-        super(AdjustmentReason, self).__init__()
-
 
 class ExactTime256(ble_data_types.BleCompoundDataType):
     data_stream_types = [ble_data_types.DayDateTime, ble_data_types.Uint8]
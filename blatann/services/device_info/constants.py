@@ -20,9 +20,19 @@ class _Characteristic:
     def __init__(self, name, uuid):
         self.uuid = uuid
         self.name = name
+        # Integer key used to index characteristics within the service. UUIDs hash to their integer value
+        self.key = hash(uuid)
+        # Name and uuid do not change after creation, format the string once
+        self._str = "{} ({})".format(name, uuid)
 
     def __str__(self):
-        return "{} ({})".format(self.name, self.uuid)
+        return self._str
+
+    def __eq__(self, other):
+        return isinstance(other, _Characteristic) and self.uuid == other.uuid
+
+    def __hash__(self):
+        return self.key
 
 
 SystemIdCharacteristic = _Characteristic("System Id", SYSTEM_ID_UUID)
@@ -19,9 +19,14 @@ class PnpId(ble_data_types.BleCompoundDataType):
         self.vendor_id = vendor_id
         self.product_id = product_id
         self.product_revision = product_revision
+        self._encoded = None
 
     def encode(self):
-        return self.encode_values(self.vendor_id_source, self.vendor_id, self.product_id, self.product_revision)
+        values = (self.vendor_id_source, self.vendor_id, self.product_id, self.product_revision)
+        # PnP IDs are typically static, re-use the encoded bytes as long as the values have not changed
+        if self._encoded is None or self._encoded[0] != values:
+            self._encoded = values, self.encode_values(*values).value
+        return ble_data_types.BleDataStream(self._encoded[1])
 
     @classmethod
     def decode(cls, stream):
@@ -40,12 +45,17 @@ class SystemId(ble_data_types.BleCompoundDataType):
         super(SystemId, self).__init__()
         self.manufacturer_id = manufacturer_id
         self.organizationally_unique_id = organizationally_unique_id
+        self._encoded = None
 
     def encode(self):
         """
         :rtype: ble_data_types.BleDataStream
         """
-        return self.encode_values(self.manufacturer_id, self.organizationally_unique_id)
+        values = (self.manufacturer_id, self.organizationally_unique_id)
+        # System IDs are typically static, re-use the encoded bytes as long as the values have not changed
+        if self._encoded is None or self._encoded[0] != values:
+            self._encoded = values, self.encode_values(*values).value
+        return ble_data_types.BleDataStream(self._encoded[1])
 
     @classmethod
     def decode(cls, stream):
@@ -10,14 +10,12 @@ from blatann.gatt.gattc import GattcService
 from blatann.gatt.gatts import GattsCharacteristicProperties, GattsService
 from blatann.services import ble_data_types
 from blatann.services.device_info.constants import (
-    DIS_SERVICE_UUID, FIRMWARE_REV_UUID, HARDWARE_REV_UUID, MANUFACTURER_NAME_UUID, MODEL_NUMBER_UUID, PNP_ID_UUID,
-    REGULATORY_CERT_UUID, SERIAL_NUMBER_UUID, SOFTWARE_REV_UUID, SYSTEM_ID_UUID, FirmwareRevisionCharacteristic,
-    HardwareRevisionCharacteristic, ManufacturerNameCharacteristic, ModelNumberCharacteristic, PnpIdCharacteristic,
-    RegulatoryCertificateCharacteristic, SerialNumberCharacteristic, SoftwareRevisionCharacteristic,
-    SystemIdCharacteristic
+    DIS_SERVICE_UUID, FirmwareRevisionCharacteristic, HardwareRevisionCharacteristic, ManufacturerNameCharacteristic,
+    ModelNumberCharacteristic, PnpIdCharacteristic, RegulatoryCertificateCharacteristic, SerialNumberCharacteristic,
+    SoftwareRevisionCharacteristic, SystemIdCharacteristic
 )
 from blatann.services.device_info.data_types import PnpId, SystemId
-from blatann.waitables import EventWaitable
+from blatann.waitables.event_waitable import IdBasedEventWaitable
 
 logger = logging.getLogger(__name__)
 
@@ -50,10 +48,17 @@ class _DisServerCharacteristic(_DisCharacteristic):
 
 
 class _DisClientCharacteristic(_DisCharacteristic):
-    def __init__(self, service, uuid, data_class):
+    def __init__(self, service, uuid, data_class, service_event):
+        """
+        :type service_event: EventSource
+        """
         super(_DisClientCharacteristic, self).__init__(service, uuid, data_class)
         self._char = service.find_characteristic(uuid)
-        self._on_read_complete_event = EventSource("Char {} Read Complete".format(self.uuid))
+        # Read completions for all characteristics in the service are dispatched through a single event,
+        # waitables filter on the read ID to receive only their own result
+        self.service_event = service_event
+        # Resolve the decoder once rather than on every read
+        self._decode = data_class.decode
 
     def _read_complete(self, characteristic, event_args):
         """
@@ -63,57 +68,57 @@ class _DisClientCharacteristic(_DisCharacteristic):
         decoded_value = None
         if event_args.status == GattStatusCode.success:
             try:
-                stream = ble_data_types.BleDataStream(event_args.value)
-                decoded_value = self.data_class.decode(stream)
+                decoded_value = self._decode(ble_data_types.BleDataStream(event_args.value))
             except Exception as e:  # TODO not so generic
-                logger.error("Service {}, Characteristic {} failed to decode value on read. "
-                             "Stream: [{}]".format(self.service.uuid, self.uuid, binascii.hexlify(event_args.value)))
-                logger.exception(e)
+                if logger.isEnabledFor(logging.ERROR):
+                    logger.error("Service %s, Characteristic %s failed to decode value on read. Stream: [%s]",
+                                 self.service.uuid, self.uuid, binascii.hexlify(event_args.value))
+                    logger.exception(e)
 
         decoded_event_args = DecodedReadCompleteEventArgs.from_read_complete_event_args(event_args, decoded_value)
-        self._on_read_complete_event.notify(characteristic, decoded_event_args)
+        self.service_event.notify(characteristic, decoded_event_args)
 
     def read(self):
         if not self.is_defined:
             raise AttributeError("Characteristic {} is not present in the Device Info Service".format(self.uuid))
-        self._char.read().then(self._read_complete)
-        return EventWaitable(self._on_read_complete_event)
+        waitable = self._char.read().then(self._read_complete)
+        return IdBasedEventWaitable(self.service_event, waitable.id)
 
 
 class _DeviceInfoService:
+    # (attribute name, characteristic, data class) for each characteristic in the service
+    _CHAR_SPECS = (
+        ("_system_id_char", SystemIdCharacteristic, SystemId),
+        ("_model_number_char", ModelNumberCharacteristic, ble_data_types.String),
+        ("_serial_no_char", SerialNumberCharacteristic, ble_data_types.String),
+        ("_firmware_rev_char", FirmwareRevisionCharacteristic, ble_data_types.String),
+        ("_hardware_rev_char", HardwareRevisionCharacteristic, ble_data_types.String),
+        ("_software_rev_char", SoftwareRevisionCharacteristic, ble_data_types.String),
+        ("_mfg_name_char", ManufacturerNameCharacteristic, ble_data_types.String),
+        ("_regulatory_cert_char", RegulatoryCertificateCharacteristic, ble_data_types.String),
+        ("_pnp_id_char", PnpIdCharacteristic, PnpId),
+    )
+
     def __init__(self, service):
+        self._on_read_complete = EventSource("DIS Read Complete", logger)
         if isinstance(service, GattsService):
             char_cls = _DisServerCharacteristic
         elif isinstance(service, GattcService):
-            char_cls = _DisClientCharacteristic
+            def char_cls(s, uuid, data_class):
+                return _DisClientCharacteristic(s, uuid, data_class, self._on_read_complete)
         else:
             raise ValueError("Service must be a Gatt Server or Client")
 
         self._service = service
-        self._system_id_char = char_cls(service, SYSTEM_ID_UUID, SystemId)
-        self._model_number_char = char_cls(service, MODEL_NUMBER_UUID, ble_data_types.String)
-        self._serial_no_char = char_cls(service, SERIAL_NUMBER_UUID, ble_data_types.String)
-        self._firmware_rev_char = char_cls(service, FIRMWARE_REV_UUID, ble_data_types.String)
-        self._hardware_rev_char = char_cls(service, HARDWARE_REV_UUID, ble_data_types.String)
-        self._software_rev_char = char_cls(service, SOFTWARE_REV_UUID, ble_data_types.String)
-        self._mfg_name_char = char_cls(service, MANUFACTURER_NAME_UUID, ble_data_types.String)
-        self._regulatory_cert_char = char_cls(service, REGULATORY_CERT_UUID, ble_data_types.String)
-        self._pnp_id_char = char_cls(service, PNP_ID_UUID, PnpId)
-
-        self._characteristics = {
-            SystemIdCharacteristic: self._system_id_char,
-            ModelNumberCharacteristic: self._model_number_char,
-            SerialNumberCharacteristic: self._serial_no_char,
-            FirmwareRevisionCharacteristic: self._firmware_rev_char,
-            HardwareRevisionCharacteristic: self._hardware_rev_char,
-            SoftwareRevisionCharacteristic: self._software_rev_char,
-            ManufacturerNameCharacteristic: self._mfg_name_char,
-            RegulatoryCertificateCharacteristic: self._regulatory_cert_char,
-            PnpIdCharacteristic: self._pnp_id_char
-        }
+        characteristics = {}
+        for attr_name, characteristic, data_class in self._CHAR_SPECS:
+            char = char_cls(service, characteristic.uuid, data_class)
+            setattr(self, attr_name, char)
+            characteristics[characteristic.key] = char
+        self._characteristics = characteristics
 
     def has(self, characteristic):
-        char = self._characteristics.get(characteristic, None)
+        char = self._characteristics.get(characteristic.key, None)
         if not char:
             return False
         return char.is_defined
@@ -163,7 +168,7 @@ class DisClient(_DeviceInfoService):
         super(DisClient, self).__init__(gattc_service)
 
     def get(self, characteristic):
-        return self._characteristics[characteristic].read()
+        return self._characteristics[characteristic.key].read()
 
     def get_system_id(self):
         return self.get(SystemIdCharacteristic)
@@ -205,7 +210,7 @@ class DisClient(_DeviceInfoService):
 
 class DisServer(_DeviceInfoService):
     def set(self, characteristic, value, max_len=None):
-        self._characteristics[characteristic].set_value(value, max_len)
+        self._characteristics[characteristic.key].set_value(value, max_len)
 
     def set_system_id(self, system_id):
         """
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from enum import IntEnum
+import struct
+from enum import IntEnum, unique
+from functools import lru_cache
 
 from blatann.services import ble_data_types
 
@@ -29,7 +31,20 @@ __all__ = [
 # See https://www.bluetooth.com/specifications/gatt/viewer?attributeXmlFile=org.bluetooth.service.glucose.xml
 # For more info about the data types and values defined here
 
+# Struct formats of the mandatory leading fields of the measurement (flags, sequence number, base time)
+# and context (flags, sequence number). Base time layout matches ble_data_types.DateTime.
+# The formats of the optional fields present are appended to these and the whole record is packed in a single call
+_MEASUREMENT_PREFIX_FORMAT = "<BHHBBBBB"
+_CONTEXT_PREFIX_FORMAT = "<BH"
 
+
+@lru_cache(maxsize=512)
+def _struct_for(fmt):
+    # The set of fields present is bounded by the 8-bit flags, so only a small number of distinct formats are produced
+    return struct.Struct(fmt)
+
+
+@unique
 class GlucoseConcentrationUnits(IntEnum):
     """
     The concentration units available for reporting glucose levels
@@ -38,6 +53,14 @@ class GlucoseConcentrationUnits(IntEnum):
     mol_per_liter = 1
 
 
+# Direct lookups between the unit enums and their flag bit values, avoids the enum constructor on every encode/decode.
+# Since IntEnum members hash as their int values, the encode tables accept either the enum members or plain ints.
+# The units are a single bit, so the decode tables are tuples indexed by the bit value
+_UNITS_TO_INT = {m: m.value for m in GlucoseConcentrationUnits}
+_INT_TO_UNITS = (GlucoseConcentrationUnits.kg_per_liter, GlucoseConcentrationUnits.mol_per_liter)
+
+
+@unique
 class GlucoseType(IntEnum):
     """
     The glucose types available
@@ -54,6 +77,7 @@ class GlucoseType(IntEnum):
     control_solution = 10
 
 
+@unique
 class SampleLocation(IntEnum):
     """
     Location which the blood sample was taken
@@ -65,6 +89,12 @@ class SampleLocation(IntEnum):
     unknown = 15
 
 
+# Value -> member lookups for the sample's type and location nibbles. Reserved values not in the enums are kept as ints
+_INT_TO_GLUCOSE_TYPE = {m.value: m for m in GlucoseType}
+_INT_TO_SAMPLE_LOCATION = {m.value: m for m in SampleLocation}
+
+
+@unique
 class MedicationUnits(IntEnum):
     """
     Available units to report medication values in
@@ -73,6 +103,11 @@ class MedicationUnits(IntEnum):
     milliliters = 1
 
 
+_MED_UNITS_TO_INT = {m: m.value for m in MedicationUnits}
+_INT_TO_MED_UNITS = (MedicationUnits.milligrams, MedicationUnits.milliliters)
+
+
+@unique
 class CarbohydrateType(IntEnum):
     """
     The type of carbohydrate consumed by the user
@@ -86,6 +121,7 @@ class CarbohydrateType(IntEnum):
     brunch = 7
 
 
+@unique
 class MealType(IntEnum):
     """
     The type of meal consumed
@@ -97,6 +133,7 @@ class MealType(IntEnum):
     bedtime = 5
 
 
+@unique
 class TesterType(IntEnum):
     """
     Information about who tested the glucose levels
@@ -107,6 +144,7 @@ class TesterType(IntEnum):
     not_available = 15
 
 
+@unique
 class HealthStatus(IntEnum):
     """
     Current health status of the user
@@ -119,6 +157,7 @@ class HealthStatus(IntEnum):
     not_available = 15
 
 
+@unique
 class MedicationType(IntEnum):
     """
     Medication type consumed
@@ -130,6 +169,7 @@ class MedicationType(IntEnum):
     premixed_insulin = 5
 
 
+@unique
 class SensorStatusType(IntEnum):
     """
     The types of sensor statuses that can be communicated
@@ -150,33 +190,18 @@ class SensorStatusType(IntEnum):
 
 class SensorStatus(ble_data_types.Bitfield):
     """
-    Class which holds the current sensor status information
+    Class which holds the current sensor status information.
+
+    Instantiated with the list of SensorStatusTypes that are currently active on the device,
+    e.g. ``SensorStatus(SensorStatusType.battery_low, SensorStatusType.time_fault)``.
+    Field names match the SensorStatusType enum names exactly
     """
+    __slots__ = tuple(t.name for t in SensorStatusType)
     bitfield_width = 16
     bitfield_enum = SensorStatusType
 
-    def __init__(self, *sensor_statuses):
-        """
-        :param sensor_statuses: The list of SensorStatusTypes that are currently active on the device
-        :type sensor_statuses: SensorStatusType
-        """
-        # Field names must match enum names exactly
-        self.battery_low = SensorStatusType.battery_low in sensor_statuses
-        self.sensor_malfunction = SensorStatusType.sensor_malfunction in sensor_statuses
-        self.sample_size_insufficient = SensorStatusType.sample_size_insufficient in sensor_statuses
-        self.strip_insertion_error = SensorStatusType.strip_insertion_error in sensor_statuses
-        self.incorrect_strip_type = SensorStatusType.incorrect_strip_type in sensor_statuses
-        self.result_above_range = SensorStatusType.result_above_range in sensor_statuses
-        self.result_below_range = SensorStatusType.result_below_range in sensor_statuses
-        self.sensor_temp_high = SensorStatusType.sensor_temp_high in sensor_statuses
-        self.sensor_temp_low = SensorStatusType.sensor_temp_low in sensor_statuses
-        self.sensor_read_interrupted = SensorStatusType.sensor_read_interrupted in sensor_statuses
-        self.general_device_fault = SensorStatusType.general_device_fault in sensor_statuses
-        self.time_fault = SensorStatusType.time_fault in sensor_statuses
-
-        super(SensorStatus, self).__init__()
-
 
+@unique
 class GlucoseFeatureType(IntEnum):
     """
     Enumeration of the supported feature types to be reported
@@ -199,36 +224,22 @@ class GlucoseFeatures(ble_data_types.Bitfield):
     """
     Class which holds the features of the glucose sensor and is reported to over bluetooth.
     This is the class used for the Feature characteristic.
+
+    Instantiated with the GlucoseFeatureTypes that are supported by the sensor,
+    e.g. ``GlucoseFeatures(GlucoseFeatureType.low_battery_detection, GlucoseFeatureType.time_fault)``.
+    Field names match the GlucoseFeatureType enum names exactly
     """
+    __slots__ = tuple(t.name for t in GlucoseFeatureType)
     bitfield_width = 16
     bitfield_enum = GlucoseFeatureType
 
-    def __init__(self, *supported_features):
-        """
-        :param supported_features: The features that are supported by the sensor
-        :type supported_features: GlucoseFeatureType
-        """
-        # Field names must match enum names exactly
-        self.low_battery_detection = GlucoseFeatureType.low_battery_detection in supported_features
-        self.sensor_malfunction_detection = GlucoseFeatureType.sensor_malfunction_detection in supported_features
-        self.sensor_sample_size = GlucoseFeatureType.sensor_sample_size in supported_features
-        self.strip_insertion_error_detection = GlucoseFeatureType.strip_insertion_error_detection in supported_features
-        self.strip_type_error_detection = GlucoseFeatureType.strip_type_error_detection in supported_features
-        self.sensor_result_high_low_detection = GlucoseFeatureType.sensor_result_high_low_detection in supported_features
-        self.sensor_temp_high_low_detection = GlucoseFeatureType.sensor_temp_high_low_detection in supported_features
-        self.sensor_read_interrupt_detection = GlucoseFeatureType.sensor_read_interrupt_detection in supported_features
-        self.general_device_fault = GlucoseFeatureType.general_device_fault in supported_features
-        self.time_fault = GlucoseFeatureType.time_fault in supported_features
-        self.multiple_bond = GlucoseFeatureType.multiple_bond in supported_features
-
-        super(GlucoseFeatures, self).__init__()
-
 
 class _MeasurementFlags(ble_data_types.Bitfield):
     """
     Bitfield used in the GlucoseMeasurement struct which defines
     which fields are present in the message
     """
+    @unique
     class Bits(IntEnum):
         time_offset_present = 0
         sample_present = 1
@@ -236,18 +247,25 @@ class _MeasurementFlags(ble_data_types.Bitfield):
         sensor_status = 3
         has_context = 4
 
+    __slots__ = tuple(b.name for b in Bits)
     bitfield_width = 8
     bitfield_enum = Bits
 
+    # Plain-int masks/shifts used by GlucoseMeasurement to build and test the raw flags byte
+    TIME_OFFSET_PRESENT_MASK = 1 << Bits.time_offset_present
+    SAMPLE_PRESENT_MASK = 1 << Bits.sample_present
+    CONCENTRATION_UNITS_SHIFT = Bits.concentration_units.value
+    SENSOR_STATUS_MASK = 1 << Bits.sensor_status
+    HAS_CONTEXT_MASK = 1 << Bits.has_context
+
     def __init__(self):
+        super(_MeasurementFlags, self).__init__()
         self.time_offset_present = False
         self.sample_present = False
         self.concentration_units = GlucoseConcentrationUnits.kg_per_liter
         self.sensor_status = False
         self.has_context = False
 
-        super(_MeasurementFlags, self).__init__()
-
 
 class GlucoseSample(ble_data_types.BleCompoundDataType):
     """
@@ -270,28 +288,39 @@ class GlucoseSample(ble_data_types.BleCompoundDataType):
         # Units are specified in a separate bitfield, not encoded or decoded
         self.units = units
 
+    # Struct format and values of the encoded fields, used to pack the sample in-line with the measurement
+    _pack_format = "HB"
+    _struct = struct.Struct("<" + _pack_format)
+
+    def _pack_values(self):
+        return (ble_data_types.SFloat.encode_raw(self.value),
+                ble_data_types.DoubleNibble.encode_raw((self.type, self.sample_location)))
+
     def encode(self):
-        stream = ble_data_types.BleDataStream()
-        stream.encode(ble_data_types.SFloat, self.value)
-        stream.encode(ble_data_types.DoubleNibble, [self.type, self.sample_location])
-        return stream
+        return ble_data_types.BleDataStream(self.encode_bytes())
+
+    def encode_bytes(self):
+        return self._struct.pack(*self._pack_values())
 
     @classmethod
     def decode(cls, stream):
         value = stream.decode(ble_data_types.SFloat)
         glucose_type, location = stream.decode(ble_data_types.DoubleNibble)
+        glucose_type = _INT_TO_GLUCOSE_TYPE.get(glucose_type, glucose_type)
+        location = _INT_TO_SAMPLE_LOCATION.get(location, location)
 
         return GlucoseSample(glucose_type, location, value)
 
     def __repr__(self):
-        return "{}({}, {}, {}, {})".format(self.__class__.__name__, str(self.type), self.value,
-                                           str(self.units), str(self.sample_location))
+        return f"{self.__class__.__name__}({self.type!s}, {self.value}, {self.units!s}, {self.sample_location!s})"
 
 
 class GlucoseMeasurement(ble_data_types.BleCompoundDataType):
     """
     Represents a single measurement taken and can be reported over BLE
     """
+    __slots__ = ("context", "measurement_time", "sample", "sensor_status", "sequence_number", "time_offset_minutes")
+
     def __init__(self, sequence_number, measurement_time, time_offset_minutes=None,
                  sample=None, sensor_status=None, context=None):
         """
@@ -315,46 +344,69 @@ class GlucoseMeasurement(ble_data_types.BleCompoundDataType):
         self.sensor_status = sensor_status
         self.context = context
 
-    def encode(self):
-        stream = ble_data_types.BleDataStream()
-
-        flags = _MeasurementFlags()
-        flags.time_offset_present = self.time_offset_minutes is not None
-        flags.sample_present = self.sample is not None
-        if flags.sample_present:
-            flags.concentration_units = int(self.sample.units)
-        flags.sensor_status = self.sensor_status is not None
-        flags.has_context = self.context is not None
-
-        stream.encode(flags)
-        stream.encode(ble_data_types.Uint16, self.sequence_number)
-        stream.encode(ble_data_types.DateTime(self.measurement_time))
-        stream.encode_if(flags.time_offset_present, ble_data_types.Int16, self.time_offset_minutes)
-        stream.encode_if(flags.sample_present, self.sample)
-        stream.encode_if(flags.sensor_status, self.sensor_status)
-
+    def encode(self, stream=None):
+        """
+        :param stream: Optional stream to append the encoded measurement to. If not provided a new stream is created
+        :type stream: ble_data_types.BleDataStream
+        :rtype: ble_data_types.BleDataStream
+        """
+        data = self.encode_bytes()
+        if stream is None:
+            return ble_data_types.BleDataStream(data)
+        stream.value += data
         return stream
 
+    def encode_bytes(self):
+        # Build the flags byte directly instead of through a _MeasurementFlags instance
+        time_offset_present = self.time_offset_minutes is not None
+        sample_present = self.sample is not None
+        sensor_status_present = self.sensor_status is not None
+        flags = ((_MeasurementFlags.TIME_OFFSET_PRESENT_MASK if time_offset_present else 0)
+                 | (_MeasurementFlags.SAMPLE_PRESENT_MASK if sample_present else 0)
+                 | ((_UNITS_TO_INT[self.sample.units] if sample_present else 0)
+                    << _MeasurementFlags.CONCENTRATION_UNITS_SHIFT)
+                 | (_MeasurementFlags.SENSOR_STATUS_MASK if sensor_status_present else 0)
+                 | (_MeasurementFlags.HAS_CONTEXT_MASK if self.context is not None else 0))
+
+        t = self.measurement_time
+        fmt = _MEASUREMENT_PREFIX_FORMAT
+        values = [flags, self.sequence_number, t.year, t.month, t.day, t.hour, t.minute, t.second]
+        if time_offset_present:
+            fmt += "h"
+            values.append(self.time_offset_minutes)
+        if sample_present:
+            fmt += self.sample._pack_format
+            values.extend(self.sample._pack_values())
+        if sensor_status_present:
+            fmt += "H"
+            values.append(self.sensor_status.to_integer_value())
+
+        return _struct_for(fmt).pack(*values)
+
     @classmethod
     def decode(cls, stream):
-        flags = stream.decode(_MeasurementFlags)
-        sequence_number = stream.decode(ble_data_types.Uint16)
-        time = stream.decode(ble_data_types.DateTime)
-        units = GlucoseConcentrationUnits(int(flags.concentration_units))
-        has_context = flags.has_context
-
-        time_offset = stream.decode_if(flags.time_offset_present, ble_data_types.Int16)
-        reading = stream.decode_if(flags.sample_present, GlucoseSample)
+        decode = stream.decode
+        decode_if = stream.decode_if
+
+        # Test the raw flags byte against the masks rather than building a _MeasurementFlags instance
+        flags = decode(ble_data_types.Uint8)
+        sequence_number = decode(ble_data_types.Uint16)
+        time = decode(ble_data_types.DateTime)
+        units = _INT_TO_UNITS[flags >> _MeasurementFlags.CONCENTRATION_UNITS_SHIFT & 1]
+        has_context = bool(flags & _MeasurementFlags.HAS_CONTEXT_MASK)
+
+        time_offset = decode_if(flags & _MeasurementFlags.TIME_OFFSET_PRESENT_MASK, ble_data_types.Int16)
+        reading = decode_if(flags & _MeasurementFlags.SAMPLE_PRESENT_MASK, GlucoseSample)
         if reading:
             reading.units = units
-        sensor_status = stream.decode_if(flags.sensor_status, SensorStatus)
+        sensor_status = decode_if(flags & _MeasurementFlags.SENSOR_STATUS_MASK, SensorStatus)
 
         return GlucoseMeasurement(sequence_number, time, time_offset, reading, sensor_status, has_context)
 
     def __repr__(self):
-        params = ["seq: {}".format(self.sequence_number), "time: {}".format(self.measurement_time)]
+        params = [f"seq: {self.sequence_number}", f"time: {self.measurement_time}"]
         if self.time_offset_minutes is not None:
-            params.append("time offset: {}".format(self.time_offset_minutes))
+            params.append(f"time offset: {self.time_offset_minutes}")
         if self.sample:
             params.append(str(self.sample))
         if self.sensor_status:
@@ -362,7 +414,7 @@ class GlucoseMeasurement(ble_data_types.BleCompoundDataType):
         if self.context:
             params.append(str(self.context))
 
-        return "{}({})".format(self.__class__.__name__, ", ".join(params))
+        return f"{self.__class__.__name__}({', '.join(params)})"
 
 
 class CarbsInfo(ble_data_types.BleCompoundDataType):
@@ -379,11 +431,18 @@ class CarbsInfo(ble_data_types.BleCompoundDataType):
         self.carbs_grams = carbs_grams
         self.carb_type = carb_type
 
+    # Struct format and values of the encoded fields, used to pack the carbs in-line with the context
+    _pack_format = "BH"
+    _struct = struct.Struct("<" + _pack_format)
+
+    def _pack_values(self):
+        return self.carb_type, ble_data_types.SFloat.encode_raw(self.carbs_grams)
+
     def encode(self):
-        stream = ble_data_types.BleDataStream()
-        stream.encode(ble_data_types.Uint8, self.carb_type)
-        stream.encode(ble_data_types.SFloat, self.carbs_grams)
-        return stream
+        return ble_data_types.BleDataStream(self.encode_bytes())
+
+    def encode_bytes(self):
+        return self._struct.pack(*self._pack_values())
 
     @classmethod
     def decode(cls, stream):
@@ -391,7 +450,7 @@ class CarbsInfo(ble_data_types.BleCompoundDataType):
         return CarbsInfo(carb_type, carbs_grams)
 
     def __repr__(self):
-        return "{}({}g, {})".format(self.__class__.__name__, self.carbs_grams, str(self.carb_type))
+        return f"{self.__class__.__name__}({self.carbs_grams}g, {self.carb_type!s})"
 
 
 class ExerciseInfo(ble_data_types.BleCompoundDataType):
@@ -411,14 +470,24 @@ class ExerciseInfo(ble_data_types.BleCompoundDataType):
         self.duration_seconds = duration_seconds
         self.intensity_percent = intensity_percent
 
-    def encode(self):
-        stream = ble_data_types.BleDataStream()
+    # Struct format and values of the encoded fields, used to pack the exercise info in-line with the context
+    _pack_format = "HB"
+    _struct = struct.Struct("<" + _pack_format)
 
+    def _pack_values(self):
         # Clamp duration to max 16-bit, max value means overrun
-        duration = max(self.duration_seconds, self.EXERCISE_DURATION_OVERRUN)
-        stream.encode(ble_data_types.Uint16, duration)
-        stream.encode(ble_data_types.Uint8, self.intensity_percent)
-        return stream
+        duration = self.duration_seconds
+        if duration is None:
+            duration = 0
+        elif duration > self.EXERCISE_DURATION_OVERRUN:
+            duration = self.EXERCISE_DURATION_OVERRUN
+        return duration, self.intensity_percent
+
+    def encode(self):
+        return ble_data_types.BleDataStream(self.encode_bytes())
+
+    def encode_bytes(self):
+        return self._struct.pack(*self._pack_values())
 
     @classmethod
     def decode(cls, stream):
@@ -426,8 +495,7 @@ class ExerciseInfo(ble_data_types.BleCompoundDataType):
         return ExerciseInfo(duration, intensity)
 
     def __repr__(self):
-        return "{}({} seconds, {}% intensity)".format(self.__class__.__name__,
-                                                      self.duration_seconds, self.intensity_percent)
+        return f"{self.__class__.__name__}({self.duration_seconds} seconds, {self.intensity_percent}% intensity)"
 
 
 class MedicationInfo(ble_data_types.BleCompoundDataType):
@@ -448,11 +516,18 @@ class MedicationInfo(ble_data_types.BleCompoundDataType):
         # Units are specified in a separate bitfield, not encoded or decoded
         self.units = med_units
 
+    # Struct format and values of the encoded fields, used to pack the medication in-line with the context
+    _pack_format = "BH"
+    _struct = struct.Struct("<" + _pack_format)
+
+    def _pack_values(self):
+        return self.type, ble_data_types.SFloat.encode_raw(self.value)
+
     def encode(self):
-        stream = ble_data_types.BleDataStream()
-        stream.encode(ble_data_types.Uint8, self.type)
-        stream.encode(ble_data_types.SFloat, self.value)
-        return stream
+        return ble_data_types.BleDataStream(self.encode_bytes())
+
+    def encode_bytes(self):
+        return self._struct.pack(*self._pack_values())
 
     @classmethod
     def decode(cls, stream):
@@ -460,7 +535,7 @@ class MedicationInfo(ble_data_types.BleCompoundDataType):
         return MedicationInfo(med_type, med_value)
 
     def __repr__(self):
-        return "{}({}, {} {})".format(self.__class__.__name__, self.value, str(self.units), str(self.type))
+        return f"{self.__class__.__name__}({self.value}, {self.units!s} {self.type!s})"
 
 
 class _GlucoseContextFlags(ble_data_types.Bitfield):
@@ -468,6 +543,7 @@ class _GlucoseContextFlags(ble_data_types.Bitfield):
     Bitfield used in the GlucoseContext struct which defines
     which fields are present in the message
     """
+    @unique
     class Bits(IntEnum):
         carb_present = 0
         meal_present = 1
@@ -478,10 +554,22 @@ class _GlucoseContextFlags(ble_data_types.Bitfield):
         hba1c_present = 6
         extended_flags_present = 7
 
+    __slots__ = tuple(b.name for b in Bits)
     bitfield_width = 8
     bitfield_enum = Bits
 
+    # Plain-int masks/shifts used by GlucoseContext to build and test the raw flags byte
+    CARB_PRESENT_MASK = 1 << Bits.carb_present
+    MEAL_PRESENT_MASK = 1 << Bits.meal_present
+    TESTER_HEALTH_PRESENT_MASK = 1 << Bits.tester_health_present
+    EXERCISE_PRESENT_MASK = 1 << Bits.exercise_present
+    MEDICATION_PRESENT_MASK = 1 << Bits.medication_present
+    MEDICATION_UNITS_SHIFT = Bits.medication_units.value
+    HBA1C_PRESENT_MASK = 1 << Bits.hba1c_present
+    EXTENDED_FLAGS_PRESENT_MASK = 1 << Bits.extended_flags_present
+
     def __init__(self):
+        super(_GlucoseContextFlags, self).__init__()
         self.carb_present = False
         self.meal_present = False
         self.tester_health_present = False
@@ -491,13 +579,13 @@ class _GlucoseContextFlags(ble_data_types.Bitfield):
         self.hba1c_present = False
         self.extended_flags_present = False
 
-        super(_GlucoseContextFlags, self).__init__()
-
 
 class GlucoseContext(ble_data_types.BleCompoundDataType):
     """
     Class which holds the extra glucose context data associated with the glucose measurement
     """
+    __slots__ = ("carbs", "exercise", "extra_flags", "hba1c_percent", "health_status", "meal_type", "medication",
+                 "sequence_number", "tester")
 
     def __init__(self, sequence_number, carbs=None, meal_type=None, tester=None, health_status=None,
                  exercise=None, medication=None, hba1c_percent=None, extra_flags=None):
@@ -529,59 +617,89 @@ class GlucoseContext(ble_data_types.BleCompoundDataType):
         self.hba1c_percent = hba1c_percent
         self.extra_flags = extra_flags
 
-    def encode(self):
-        stream = ble_data_types.BleDataStream()
-
-        flags = _GlucoseContextFlags()
-        flags.carb_present = self.carbs is not None
-        flags.meal_present = self.meal_type is not None
-        flags.tester_health_present = self.tester is not None
-        flags.exercise_present = self.exercise is not None
-        flags.medication_present = self.medication is not None
-        if flags.medication_present:
-            flags.medication_units = self.medication.units
-        flags.hba1c_present = self.hba1c_percent is not None
-        flags.extended_flags_present = self.extra_flags is not None
-
-        stream.encode(flags)
-        stream.encode(ble_data_types.Uint16, self.sequence_number)
-
-        stream.encode_if(flags.extended_flags_present, ble_data_types.Uint8, self.extra_flags)
-        stream.encode_if(flags.carb_present, self.carbs)
-
-        stream.encode_if(flags.meal_present, ble_data_types.Uint8, self.meal_type)
-        stream.encode_if(flags.tester_health_present, ble_data_types.DoubleNibble, [self.tester, self.health_status])
-
-        stream.encode_if(flags.exercise_present, self.exercise)
-
-        stream.encode_if(flags.medication_present, self.medication)
-        stream.encode_if(flags.hba1c_present, ble_data_types.SFloat, self.hba1c_percent)
-
+    def encode(self, stream=None):
+        """
+        :param stream: Optional stream to append the encoded context to. If not provided a new stream is created
+        :type stream: ble_data_types.BleDataStream
+        :rtype: ble_data_types.BleDataStream
+        """
+        data = self.encode_bytes()
+        if stream is None:
+            return ble_data_types.BleDataStream(data)
+        stream.value += data
         return stream
 
+    def encode_bytes(self):
+        # Build the flags byte directly instead of through a _GlucoseContextFlags instance
+        carb_present = self.carbs is not None
+        meal_present = self.meal_type is not None
+        tester_health_present = self.tester is not None
+        exercise_present = self.exercise is not None
+        medication_present = self.medication is not None
+        hba1c_present = self.hba1c_percent is not None
+        extended_flags_present = self.extra_flags is not None
+        flags = ((_GlucoseContextFlags.CARB_PRESENT_MASK if carb_present else 0)
+                 | (_GlucoseContextFlags.MEAL_PRESENT_MASK if meal_present else 0)
+                 | (_GlucoseContextFlags.TESTER_HEALTH_PRESENT_MASK if tester_health_present else 0)
+                 | (_GlucoseContextFlags.EXERCISE_PRESENT_MASK if exercise_present else 0)
+                 | (_GlucoseContextFlags.MEDICATION_PRESENT_MASK if medication_present else 0)
+                 | ((_MED_UNITS_TO_INT[self.medication.units] if medication_present else 0)
+                    << _GlucoseContextFlags.MEDICATION_UNITS_SHIFT)
+                 | (_GlucoseContextFlags.HBA1C_PRESENT_MASK if hba1c_present else 0)
+                 | (_GlucoseContextFlags.EXTENDED_FLAGS_PRESENT_MASK if extended_flags_present else 0))
+
+        fmt = _CONTEXT_PREFIX_FORMAT
+        values = [flags, self.sequence_number]
+        if extended_flags_present:
+            fmt += "B"
+            values.append(self.extra_flags)
+        if carb_present:
+            fmt += self.carbs._pack_format
+            values.extend(self.carbs._pack_values())
+        if meal_present:
+            fmt += "B"
+            values.append(self.meal_type)
+        if tester_health_present:
+            fmt += "B"
+            values.append(ble_data_types.DoubleNibble.encode_raw((self.tester, self.health_status)))
+        if exercise_present:
+            fmt += self.exercise._pack_format
+            values.extend(self.exercise._pack_values())
+        if medication_present:
+            fmt += self.medication._pack_format
+            values.extend(self.medication._pack_values())
+        if hba1c_present:
+            fmt += "H"
+            values.append(ble_data_types.SFloat.encode_raw(self.hba1c_percent))
+
+        return _struct_for(fmt).pack(*values)
+
     @classmethod
     def decode(cls, stream):
         """
         :type stream: ble_data_types.BleDataStream
         """
-        flags = stream.decode(_GlucoseContextFlags)
-        med_units = MedicationUnits(int(flags.medication_units))
+        decode_if = stream.decode_if
+
+        # Test the raw flags byte against the masks rather than building a _GlucoseContextFlags instance
+        flags = stream.decode(ble_data_types.Uint8)
+        med_units = _INT_TO_MED_UNITS[flags >> _GlucoseContextFlags.MEDICATION_UNITS_SHIFT & 1]
 
         sequence_number = stream.decode(ble_data_types.Uint16)
-        extended_flags = stream.decode_if(flags.extended_flags_present, ble_data_types.Uint8)
-        carbs = stream.decode_if(flags.carb_present, CarbsInfo)
-        meal_type = stream.decode_if(flags.meal_present, ble_data_types.Uint8)
-        tester, health = stream.decode_if(flags.tester_health_present, ble_data_types.DoubleNibble)
-        exercise = stream.decode_if(flags.exercise_present, ExerciseInfo)
-        medication = stream.decode_if(flags.medication_present, MedicationInfo)
+        extended_flags = decode_if(flags & _GlucoseContextFlags.EXTENDED_FLAGS_PRESENT_MASK, ble_data_types.Uint8)
+        carbs = decode_if(flags & _GlucoseContextFlags.CARB_PRESENT_MASK, CarbsInfo)
+        meal_type = decode_if(flags & _GlucoseContextFlags.MEAL_PRESENT_MASK, ble_data_types.Uint8)
+        tester, health = decode_if(flags & _GlucoseContextFlags.TESTER_HEALTH_PRESENT_MASK, ble_data_types.DoubleNibble)
+        exercise = decode_if(flags & _GlucoseContextFlags.EXERCISE_PRESENT_MASK, ExerciseInfo)
+        medication = decode_if(flags & _GlucoseContextFlags.MEDICATION_PRESENT_MASK, MedicationInfo)
         if medication:
             medication.units = med_units
-        hba1c = stream.decode_if(flags.hba1c_present, ble_data_types.SFloat)
+        hba1c = decode_if(flags & _GlucoseContextFlags.HBA1C_PRESENT_MASK, ble_data_types.SFloat)
 
         return GlucoseContext(sequence_number, carbs, meal_type, tester, health, exercise, medication, hba1c, extended_flags)
 
     def __repr__(self):
-        params = ["seq: {}".format(self.sequence_number)]
+        params = [f"seq: {self.sequence_number}"]
         if self.carbs:
             params.append(str(self.carbs))
         if self.meal_type:
@@ -595,7 +713,7 @@ class GlucoseContext(ble_data_types.BleCompoundDataType):
         if self.medication:
             params.append(str(self.medication))
         if self.hba1c_percent:
-            params.append("hba1c: {}%".format(self.hba1c_percent))
+            params.append(f"hba1c: {self.hba1c_percent}%")
         if self.extra_flags:
-            params.append("extra_flags: {}".format(self.extra_flags))
-        return "{}({})".format(self.__class__.__name__, ", ".join(params))
+            params.append(f"extra_flags: {self.extra_flags}")
+        return f"{self.__class__.__name__}({', '.join(params)})"
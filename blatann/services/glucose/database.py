@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import abc
+import bisect
 import logging
-from threading import RLock
-from typing import Optional
+from operator import attrgetter
+from threading import Lock
+from typing import Iterable, Optional
 
 from blatann.services.glucose.data_types import GlucoseMeasurement
 from blatann.services.glucose.racp import RacpResponseCode
@@ -10,49 +13,59 @@ from blatann.services.glucose.racp import RacpResponseCode
 logger = logging.getLogger(__name__)
 
 
-class IGlucoseDatabase:
+class IGlucoseDatabase(abc.ABC):
     """
     Defines the interface required for the Glucose Service to fetch records and record info
     """
+    #: Set to True by databases whose get_records() always returns records in ascending sequence number order.
+    #: If False the records are sorted by the Glucose Service before being reported
+    returns_sorted_records = False
+
+    @abc.abstractmethod
     def first_record(self) -> Optional[GlucoseMeasurement]:
         """
         Gets the first (oldest) record in the database
 
         :return: The first record in the database, or None if no records in the database
         """
-        raise NotImplementedError()
 
+    @abc.abstractmethod
     def last_record(self) -> Optional[GlucoseMeasurement]:
         """
         Gets the last (newest) record in the database
 
         :return: The last record in the database, or None if no records in the database
         """
-        raise NotImplementedError()
 
     def record_count(self, min_seq_num: int = None, max_seq_num: int = None) -> int:
         """
         Gets the number of records between the minimum and maximum sequence numbers provided.
         The min/max limits are inclusive.
 
+        The default implementation counts the records returned by get_records().
+        Databases which can count records without iterating them should override this.
+
         :param min_seq_num: The minimum sequence number to get. If None, no minimum is requested
         :param max_seq_num: The maximum sequence number to get. If None, no maximum is requested
         :return: The number of records that fit the parameters specified
         :rtype: int
         """
-        raise NotImplementedError()
+        return sum(1 for _ in self.get_records(min_seq_num, max_seq_num))
 
-    def get_records(self, min_seq_num: int = None, max_seq_num: int = None) -> list[GlucoseMeasurement]:
+    @abc.abstractmethod
+    def get_records(self, min_seq_num: int = None, max_seq_num: int = None) -> Iterable[GlucoseMeasurement]:
         """
-        Gets a list of the records between the minimum sequence and maximum sequence numbers provided.
+        Gets the records between the minimum sequence and maximum sequence numbers provided.
         The min/max limits are inclusive.
 
+        The records may be returned as any iterable (e.g. a list or a generator), they are only iterated once
+
         :param min_seq_num: The minimum sequence number to get. If None, no minimum is requested
         :param max_seq_num: The maximum sequence number to get. If None, no maximum is requested
-        :return: The list of glucose measurement records that fit the parameters
+        :return: The glucose measurement records that fit the parameters
         """
-        raise NotImplementedError()
 
+    @abc.abstractmethod
     def delete_records(self, min_seq_num: int = None, max_seq_num: int = None) -> RacpResponseCode:
         """
         Deletes the records between the minimum sequence and maximum sequence numbers provided.
@@ -62,7 +75,6 @@ class IGlucoseDatabase:
         :param max_seq_num: The maximum sequence number to get. If None, no maximum is requested
         :return: The response code to send back for the operation
         """
-        raise NotImplementedError()
 
 
 class BasicGlucoseDatabase(IGlucoseDatabase):
@@ -70,44 +82,53 @@ class BasicGlucoseDatabase(IGlucoseDatabase):
     Basic glucose database which simply stores the records in a sorted list, and provides a method for adding
     new records to the database.
     """
+    # Records are stored sorted, so get_records() returns a sorted slice without needing to copy the whole list
+    returns_sorted_records = True
+
     def __init__(self, init_records=None):
         self._records: list[GlucoseMeasurement] = []
         if init_records is not None:
-            self._records = init_records
-        self._lock = RLock()
+            self._records = sorted(init_records, key=attrgetter("sequence_number"))
+        # Sequence numbers of the records, kept in the same order as the records so they can be bisected
+        self._seq_numbers: list[int] = [r.sequence_number for r in self._records]
+        self._lock = Lock()
 
-    def _sort(self):
-        with self._lock:
-            self._records = sorted(self._records, key=lambda r: r.sequence_number)
+    def _range_indices(self, min_seq_num, max_seq_num):
+        # Gets the [lo, hi) slice indices of the records within the inclusive range. Lock must be held by the caller
+        lo = 0 if min_seq_num is None else bisect.bisect_left(self._seq_numbers, min_seq_num)
+        hi = len(self._seq_numbers) if max_seq_num is None else bisect.bisect_right(self._seq_numbers, max_seq_num)
+        return lo, hi
 
     def _get_records_in_range(self, min_seq_num, max_seq_num):
         with self._lock:
-            records = self._records[:]
-
-        if min_seq_num is not None:
-            records = [r for r in records if r.sequence_number >= min_seq_num]
-        if max_seq_num is not None:
-            records = [r for r in records if r.sequence_number <= max_seq_num]
-        return records
+            lo, hi = self._range_indices(min_seq_num, max_seq_num)
+            return self._records[lo:hi]
 
     def delete_records(self, min_seq_num=None, max_seq_num=None):
         """
         See IGlucoseDatabase
         """
+        log_enabled = logger.isEnabledFor(logging.INFO)
         with self._lock:
-            records = self._get_records_in_range(min_seq_num, max_seq_num)
-            logger.info("Deleting records between {} and {} - seqs: {}".format(min_seq_num, max_seq_num,
-                                                                               [r.sequence_number for r in records]))
-            for r in records:
-                self._records.remove(r)
+            lo, hi = self._range_indices(min_seq_num, max_seq_num)
+            seq_nums = self._seq_numbers[lo:hi] if log_enabled else None
+            # Records in range are contiguous, remove them in a single slice deletion
+            del self._records[lo:hi]
+            del self._seq_numbers[lo:hi]
+        # Log outside of the lock to keep the critical section to just the list operations
+        if log_enabled:
+            logger.info("Deleting records between %s and %s - seqs: %s", min_seq_num, max_seq_num, seq_nums)
         return RacpResponseCode.success
 
     def record_count(self, min_seq_num=None, max_seq_num=None):
         """
         See IGlucoseDatabase
         """
-        num_records = len(self._get_records_in_range(min_seq_num, max_seq_num))
-        logger.info("Got record count between {} and {} -  {} records".format(min_seq_num, max_seq_num, num_records))
+        with self._lock:
+            lo, hi = self._range_indices(min_seq_num, max_seq_num)
+        # An inverted range (min > max) yields hi < lo
+        num_records = max(hi - lo, 0)
+        logger.info("Got record count between %s and %s -  %s records", min_seq_num, max_seq_num, num_records)
         return num_records
 
     def get_records(self, min_seq_num=None, max_seq_num=None):
@@ -115,8 +136,9 @@ class BasicGlucoseDatabase(IGlucoseDatabase):
         See IGlucoseDatabase
         """
         records = self._get_records_in_range(min_seq_num, max_seq_num)
-        logger.info("Getting records between {} and {} - seqs: {}".format(min_seq_num, max_seq_num,
-                                                                          [r.sequence_number for r in records]))
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Getting records between %s and %s - seqs: %s", min_seq_num, max_seq_num,
+                        [r.sequence_number for r in records])
         return records
 
     def first_record(self):
@@ -129,7 +151,8 @@ class BasicGlucoseDatabase(IGlucoseDatabase):
             else:
                 record = None
 
-        logger.info("Glucose DB: First record requested: {}".format(record))
+        # Lazily formatted, the record's repr is only built if the message is emitted
+        logger.info("Glucose DB: First record requested: %s", record)
         return record
 
     def last_record(self):
@@ -142,7 +165,7 @@ class BasicGlucoseDatabase(IGlucoseDatabase):
             else:
                 record = None
 
-        logger.info("Glucose DB: Last record requested: {}".format(record))
+        logger.info("Glucose DB: Last record requested: %s", record)
         return record
 
     def add_record(self, glucose_measurement: GlucoseMeasurement):
@@ -151,8 +174,11 @@ class BasicGlucoseDatabase(IGlucoseDatabase):
 
         :param glucose_measurement: The measurement to add
         """
+        seq_num = glucose_measurement.sequence_number
         with self._lock:
-            if glucose_measurement.sequence_number in [r.sequence_number for r in self._records]:
-                raise ValueError("Database already contains a measurement with sequence number {}".format(glucose_measurement.sequence_number))
-            self._records.append(glucose_measurement)
-        self._sort()
+            # Records are kept sorted by sequence number, insert at the sorted position instead of re-sorting
+            index = bisect.bisect_left(self._seq_numbers, seq_num)
+            if index < len(self._seq_numbers) and self._seq_numbers[index] == seq_num:
+                raise ValueError("Database already contains a measurement with sequence number {}".format(seq_num))
+            self._seq_numbers.insert(index, seq_num)
+            self._records.insert(index, glucose_measurement)
@@ -1,11 +1,19 @@
 from __future__ import annotations
 
-from enum import IntEnum
+import struct
+from enum import IntEnum, unique
 
 from blatann.exceptions import DecodeError
 from blatann.services import ble_data_types
 
+# Command header: opcode, operator
+_COMMAND_HEADER_STRUCT = struct.Struct("<BB")
+# Response payloads: opcode, operator, then either request opcode + response code or the record count
+_RESPONSE_CODE_STRUCT = struct.Struct("<BBBB")
+_RECORD_COUNT_STRUCT = struct.Struct("<BBH")
 
+
+@unique
 class RacpOpcode(IntEnum):
     report_stored_records = 1
     delete_stored_records = 2
@@ -15,6 +23,7 @@ class RacpOpcode(IntEnum):
     response_code = 6
 
 
+@unique
 class RacpOperator(IntEnum):
     null = 0
     all_records = 1
@@ -25,11 +34,13 @@ class RacpOperator(IntEnum):
     last_record = 6
 
 
+@unique
 class FilterType(IntEnum):
     sequence_number = 1
     user_facing_time = 2
 
 
+@unique
 class RacpResponseCode(IntEnum):
     success = 1
     not_supported = 2
@@ -42,7 +53,26 @@ class RacpResponseCode(IntEnum):
     operand_not_supported = 9
 
 
+# Value -> member lookups used when decoding, avoids going through the Enum constructor
+_OPCODES_BY_VALUE = {m.value: m for m in RacpOpcode}
+_OPERATORS_BY_VALUE = {m.value: m for m in RacpOperator}
+
+# Raw values of the constant fields written into every response
+_RESPONSE_CODE_OPCODE = RacpOpcode.response_code.value
+_NUMBER_OF_RECORDS_OPCODE = RacpOpcode.number_of_records_response.value
+_NULL_OPERATOR = RacpOperator.null.value
+
+
 class RacpCommand(ble_data_types.BleCompoundDataType):
+    __slots__ = ("filter_params", "filter_type", "opcode", "operator")
+
+    # Maps the operators which filter on a range to a function returning the (min, max) from the filter params
+    _FILTER_MIN_MAX = {
+        RacpOperator.less_than_or_equal_to: lambda p: (None, p[0]),
+        RacpOperator.greater_than_or_equal_to: lambda p: (p[0], None),
+        RacpOperator.within_range_inclusive: lambda p: (p[0], p[1]),
+    }
+
     def __init__(self, opcode, operator, filter_type=None, filter_params=None):
         """
         :type opcode: RacpOpcode
@@ -58,44 +88,60 @@ class RacpCommand(ble_data_types.BleCompoundDataType):
         self.filter_params = filter_params
 
     def get_filter_min_max(self):
-        if self.operator == RacpOperator.all_records:
+        min_max = self._FILTER_MIN_MAX.get(self.operator)
+        if min_max is None:
+            # All/First/Last record, return Nones
             return None, None
-        if self.operator == RacpOperator.less_than_or_equal_to:
-            return None, self.filter_params[0]
-        if self.operator == RacpOperator.greater_than_or_equal_to:
-            return self.filter_params[0], None
-        if self.operator == RacpOperator.within_range_inclusive:
-            return self.filter_params[0], self.filter_params[1]
-        # First/Last record, return Nones
-        return None, None
-
-    def encode(self):
-        stream = ble_data_types.BleDataStream()
-        stream.encode(ble_data_types.Uint8, self.opcode)
-        stream.encode(ble_data_types.Uint8, self.operator)
-        if self.filter_type is not None:
-            stream.encode(ble_data_types.Uint8, self.filter_type)
-            for f in self.filter_params:
-                stream.encode(ble_data_types.Uint16, f)
+        try:
+            return min_max(self.filter_params)
+        except IndexError:
+            raise DecodeError("RACP operator {} is missing filter params, got: {}".format(
+                self.operator, self.filter_params)) from None
+
+    def encode(self, stream=None):
+        """
+        :param stream: Optional stream to append the encoded command to. If not provided a new stream is created
+        :type stream: ble_data_types.BleDataStream
+        :rtype: ble_data_types.BleDataStream
+        """
+        data = self.encode_bytes()
+        if stream is None:
+            return ble_data_types.BleDataStream(data)
+        stream.value += data
         return stream
 
+    def encode_bytes(self):
+        if self.filter_type is None:
+            return _COMMAND_HEADER_STRUCT.pack(self.opcode, self.operator)
+        # Opcode, operator and filter type followed by the uint16 filter params, packed in one go
+        params = self.filter_params
+        return struct.pack("<BBB" + "H" * len(params), self.opcode, self.operator, self.filter_type, *params)
+
     @classmethod
     def decode(cls, stream):
-        opcode = stream.decode(ble_data_types.Uint8)
-        operator = stream.decode(ble_data_types.Uint8)
-        if len(stream) > 0:
-            filter_type = stream.decode(ble_data_types.Uint8)
-            filter_params = []
-            while len(stream) >= 2:
-                filter_params.append(stream.decode(ble_data_types.Uint16))
+        # Unpack directly from the underlying buffer rather than decoding field by field
+        value = stream.value
+        index = stream.decode_index
+        opcode, operator = _COMMAND_HEADER_STRUCT.unpack_from(value, index)
+        index += _COMMAND_HEADER_STRUCT.size
+        if len(value) > index:
+            filter_type = value[index]
+            index += 1
+            # Filter params are a sequence of uint16s, unpack them all at once. Any trailing odd byte is ignored
+            param_count = (len(value) - index) // 2
+            filter_params = list(struct.unpack_from("<{}H".format(param_count), value, index))
+            index += param_count * 2
         else:
             filter_type = None
-            filter_params = None
+            filter_params = []
+        stream.decode_index = index
 
         return RacpCommand(opcode, operator, filter_type, filter_params)
 
 
 class RacpResponse(ble_data_types.BleCompoundDataType):
+    __slots__ = ("record_count", "request_code", "response_code")
+
     def __init__(self, request_opcode=None, response_code=None, record_count=None):
         """
         :type request_opcode: RacpOpcode
@@ -106,23 +152,33 @@ class RacpResponse(ble_data_types.BleCompoundDataType):
         self.response_code = response_code
         self.record_count = record_count
 
-    def encode(self):
-        stream = ble_data_types.BleDataStream()
-        if self.record_count is None:
-            stream.encode_multiple([ble_data_types.Uint8, RacpOpcode.response_code],
-                                   [ble_data_types.Uint8, RacpOperator.null],
-                                   [ble_data_types.Uint8, self.request_code],
-                                   [ble_data_types.Uint8, self.response_code])
-        else:
-            stream.encode_multiple([ble_data_types.Uint8, RacpOpcode.number_of_records_response],
-                                   [ble_data_types.Uint8, RacpOperator.null],
-                                   [ble_data_types.Uint16, self.record_count])
+    def encode(self, stream=None):
+        """
+        :param stream: Optional stream to append the encoded response to. If not provided a new stream is created
+        :type stream: ble_data_types.BleDataStream
+        :rtype: ble_data_types.BleDataStream
+        """
+        data = self.encode_bytes()
+        if stream is None:
+            return ble_data_types.BleDataStream(data)
+        stream.value += data
         return stream
 
+    def encode_bytes(self):
+        if self.record_count is None:
+            return _RESPONSE_CODE_STRUCT.pack(_RESPONSE_CODE_OPCODE, _NULL_OPERATOR,
+                                              self.request_code, self.response_code)
+        return _RECORD_COUNT_STRUCT.pack(_NUMBER_OF_RECORDS_OPCODE, _NULL_OPERATOR, self.record_count)
+
     @classmethod
     def decode(cls, stream):
-        opcode = RacpOpcode(stream.decode(ble_data_types.Uint8))
-        _ = RacpOperator(stream.decode(ble_data_types.Uint8))
+        opcode_value = stream.decode(ble_data_types.Uint8)
+        operator_value = stream.decode(ble_data_types.Uint8)
+        opcode = _OPCODES_BY_VALUE.get(opcode_value)
+        if opcode is None:
+            raise DecodeError("Unable to decode RACP Response, got unknown opcode: {}".format(opcode_value))
+        if operator_value not in _OPERATORS_BY_VALUE:
+            raise DecodeError("Unable to decode RACP Response, got unknown operator: {}".format(operator_value))
 
         if opcode == RacpOpcode.response_code:
             request_opcode, response_code = stream.decode_multiple(ble_data_types.Uint8, ble_data_types.Uint8)
@@ -1,13 +1,15 @@
 from __future__ import annotations
 
 import logging
-from typing import List
+from collections import deque
+from operator import attrgetter
+from typing import Deque, Optional, Tuple
 
 from blatann.event_args import WriteEventArgs
+from blatann.exceptions import DecodeError
 from blatann.gatt import SecurityLevel
 from blatann.gatt.gatts import GattsCharacteristicProperties, GattsService
 from blatann.services import ble_data_types
-from blatann.services.glucose import GlucoseMeasurement
 from blatann.services.glucose.constants import (
     FEATURE_CHARACTERISTIC_UUID, GLUCOSE_SERVICE_UUID, MEASUREMENT_CHARACTERISTIC_UUID,
     MEASUREMENT_CONTEXT_CHARACTERISTIC_UUID, RACP_CHARACTERISTIC_UUID
@@ -20,6 +22,21 @@ from blatann.services.glucose.racp import (
 
 logger = logging.getLogger(__name__)
 
+# Raw values of the opcodes/operators checked on every RACP write, compared against the decoded command values
+_REPORT_STORED_RECORDS = RacpOpcode.report_stored_records.value
+_DELETE_STORED_RECORDS = RacpOpcode.delete_stored_records.value
+_ABORT_OPERATION = RacpOpcode.abort_operation.value
+_REPORT_NUMBER_OF_RECORDS = RacpOpcode.report_number_of_records.value
+_FIRST_RECORD = RacpOperator.first_record.value
+_LAST_RECORD = RacpOperator.last_record.value
+
+# Encoded success responses sent once a command's records have all been reported, keyed by request opcode
+_SUCCESS_RESPONSES = {op.value: RacpResponse(op, RacpResponseCode.success).encode_bytes() for op in RacpOpcode}
+
+_SUPPORTED_FILTER_TYPES = frozenset([None, FilterType.sequence_number])
+_RANGE_OPERATORS = frozenset([RacpOperator.all_records, RacpOperator.less_than_or_equal_to,
+                              RacpOperator.greater_than_or_equal_to, RacpOperator.within_range_inclusive])
+
 
 class GlucoseServer:
     def __init__(self, service, glucose_database, security_level=SecurityLevel.OPEN,
@@ -48,8 +65,11 @@ class GlucoseServer:
         self.racp_characteristic = service.add_characteristic(RACP_CHARACTERISTIC_UUID, racp_props)
         self.racp_characteristic.on_write.register(self._on_racp_write)
         self._current_command = None
-        self._records_to_report: List[GlucoseMeasurement] = []
-        self._active_notifications = []
+        # True while records are being reported for the current command
+        self._reporting = False
+        # Encoded (measurement, context) payloads of the records left to report
+        self._records_to_report: Deque[Tuple[bytes, Optional[bytes]]] = deque()
+        self._active_notifications = set()
         self.service.peer.on_disconnect.register(self._on_disconnect)
         self.measurement_characteristic.on_notify_complete.register(self._on_notify_complete)
 
@@ -59,42 +79,69 @@ class GlucoseServer:
 
         :param features: The supported features of the sensor
         """
-        self.feature_characteristic.set_value(features.encode().value, False)
+        self.feature_characteristic.set_value(features.encode_bytes(), False)
 
     def _report_records(self):
-        if self._current_command:
-            for record in self._records_to_report:
-                noti_id = self.measurement_characteristic.notify(record.encode().value).id
-                self._active_notifications.append(noti_id)
-                if record.context and self.context_characteristic and self.context_characteristic.client_subscribed:
-                    noti_id = self.context_characteristic.notify(record.context.encode().value).id
-                    self._active_notifications.append(noti_id)
+        if self._reporting:
+            # Drain the queue so records are released as soon as they're handed off for notification
+            records_to_report = self._records_to_report
+            # Bind the per-record calls once for the loop. Notification IDs are tracked as soon as each is queued
+            # since its completion can come in before the rest of the records are queued
+            notify_measurement = self.measurement_characteristic.notify
+            track_notification = self._active_notifications.add
+            # Context payloads are only encoded if the context characteristic exists.
+            # The subscription state does not change while the records are being queued
+            context_char = self.context_characteristic
+            context_enabled = context_char is not None and context_char.client_subscribed
+            while records_to_report:
+                measurement_data, context_data = records_to_report.popleft()
+                track_notification(notify_measurement(measurement_data).id)
+                if context_enabled and context_data:
+                    track_notification(context_char.notify(context_data).id)
 
     def _on_report_records_request(self, command: RacpCommand):
-        if self._current_command is not None:
+        if self._reporting:
             return RacpResponseCode.procedure_not_completed
-        if command.filter_type not in [None, FilterType.sequence_number]:
+        if command.filter_type not in _SUPPORTED_FILTER_TYPES:
             return RacpResponseCode.operand_not_supported
 
-        if command.operator in [RacpOperator.first_record, RacpOperator.last_record]:
-            if command.operator == RacpOperator.first_record:
+        operator = command.operator
+        if operator == _FIRST_RECORD or operator == _LAST_RECORD:
+            if operator == _FIRST_RECORD:
                 record = self.database.first_record()
             else:
                 record = self.database.last_record()
-            records = [record] if record else []
-        elif command.operator in [RacpOperator.all_records, RacpOperator.less_than_or_equal_to,
-                                  RacpOperator.greater_than_or_equal_to, RacpOperator.within_range_inclusive]:
+            if not record:
+                return RacpResponseCode.no_records_found
+            records = [record]
+        elif operator in _RANGE_OPERATORS:
             min_seq, max_seq = command.get_filter_min_max()
             records = self.database.get_records(min_seq, max_seq)
+            # Records may be any iterable, materialize them once in order
+            if getattr(self.database, "returns_sorted_records", False):
+                records = list(records)
+            else:
+                records = sorted(records, key=attrgetter("sequence_number"))
+            if not records:
+                return RacpResponseCode.no_records_found
         else:
             return RacpResponseCode.invalid_operator
 
-        if len(records) == 0:
-            return RacpResponseCode.no_records_found
+        if not self.measurement_characteristic.client_subscribed:
+            # Records can't be reported without measurement notifications, don't bother encoding them
+            return RacpResponseCode.procedure_not_completed
+
+        # Encode all the records up front so reporting only has to send the notifications.
+        # Contexts are only encoded if there's a subscribed characteristic to send them on
+        context_char = self.context_characteristic
+        encode_context = context_char is not None and context_char.client_subscribed
+        self._records_to_report = deque(
+            (r.encode_bytes(), r.context.encode_bytes() if encode_context and r.context else None) for r in records
+        )
 
         # Start reporting records
-        self._records_to_report = sorted(records, key=lambda r: r.sequence_number)
         self._current_command = command
+        self._reporting = True
 
         self._report_records()
         # Do not send a response, will be sent once all records reported
@@ -109,9 +156,10 @@ class GlucoseServer:
         return self.database.delete_records(min_seq, max_seq)
 
     def _on_abort_operation(self):
-        if self._current_command is not None:
+        if self._reporting:
             self._current_command = None
-            self._records_to_report = []
+            self._reporting = False
+            self._records_to_report.clear()
             return RacpResponseCode.success
         return RacpResponseCode.abort_not_successful
 
@@ -121,42 +169,49 @@ class GlucoseServer:
 
         response = None
 
-        if command.opcode == RacpOpcode.report_number_of_records:
-            record_count = self._on_report_num_records_request(command)
-            response = RacpResponse(record_count=record_count)
-        else:
-            response_code = None
-            if command.opcode == RacpOpcode.report_stored_records:
-                response_code = self._on_report_records_request(command)
-            elif command.opcode == RacpOpcode.delete_stored_records:
-                response_code = self._on_delete_records_request(command)
-            elif command.opcode == RacpOpcode.abort_operation:
-                response_code = self._on_abort_operation()
-
-            if response_code is not None:
-                response = RacpResponse(command.opcode, response_code)
+        opcode = command.opcode
+        try:
+            if opcode == _REPORT_NUMBER_OF_RECORDS:
+                record_count = self._on_report_num_records_request(command)
+                response = RacpResponse(record_count=record_count)
+            else:
+                response_code = None
+                if opcode == _REPORT_STORED_RECORDS:
+                    response_code = self._on_report_records_request(command)
+                elif opcode == _DELETE_STORED_RECORDS:
+                    response_code = self._on_delete_records_request(command)
+                elif opcode == _ABORT_OPERATION:
+                    response_code = self._on_abort_operation()
+
+                if response_code is not None:
+                    response = RacpResponse(opcode, response_code)
+        except DecodeError as e:
+            # The command's operator requires filter params which weren't provided
+            logger.warning("Invalid RACP command: %s", e)
+            response = RacpResponse(opcode, RacpResponseCode.invalid_operand)
 
         if response:
-            self.racp_characteristic.notify(response.encode().value)
+            self.racp_characteristic.notify(response.encode_bytes())
 
     def _on_notify_complete(self, characteristic, event_args):
         """
         :param characteristic:
         :type event_args: blatann.event_args.NotificationCompleteEventArgs
         """
-        if event_args.id in self._active_notifications:
-            self._active_notifications.remove(event_args.id)
+        self._active_notifications.discard(event_args.id)
 
-        if not self._active_notifications:
+        if self._reporting and not self._active_notifications:
             # Done reporting
-            response = RacpResponse(self._current_command.opcode, RacpResponseCode.success)
+            response = _SUCCESS_RESPONSES[self._current_command.opcode]
             self._current_command = None
-            self.racp_characteristic.notify(response.encode().value)
+            self._reporting = False
+            self.racp_characteristic.notify(response)
 
     def _on_disconnect(self, peer, event_args):
         self._current_command = None
-        self._active_notifications = []
-        self._records_to_report = []
+        self._reporting = False
+        self._active_notifications.clear()
+        self._records_to_report.clear()
 
     @classmethod
     def add_to_database(cls, gatts_database, glucose_database, security_level=SecurityLevel.OPEN,
@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 import logging
+import struct
 
 from blatann import exceptions
 from blatann.event_type import Event, EventSource
 from blatann.gatt import MTU_SIZE_DEFAULT, WRITE_BYTE_OVERHEAD
 from blatann.gatt.gatts import GattsCharacteristicProperties, GattsService
-from blatann.services.ble_data_types import BleDataStream, Uint16
+from blatann.services.ble_data_types import Uint16
 from blatann.services.nordic_uart import (
     NORDIC_UART_FEATURE_CHARACTERISTIC_UUID, NORDIC_UART_RX_CHARACTERISTIC_UUID, NORDIC_UART_SERVICE_UUID,
     NORDIC_UART_TX_CHARACTERISTIC_UUID
@@ -133,7 +134,8 @@ class NordicUartClient:
             self._feature_char.read().then(self._process_feature_value)
 
     def _process_feature_value(self, characteristic, event_args):
-        self._server_characteristic_size = Uint16.decode(BleDataStream(event_args.value))
+        # Single uint16 value, unpack it directly rather than wrapping it in a stream
+        self._server_characteristic_size = struct.unpack_from("<H", event_args.value)[0]
         self._init_complete_event.notify(self, None)
 
     def _on_notify_received(self, characteristic, event_args):
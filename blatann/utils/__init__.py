@@ -1,20 +1,24 @@
 from __future__ import annotations
 
 import enum
+import itertools
 import logging
 import sys
-import threading
 import time
 
 from blatann.utils import _threading
 
 LOG_FORMAT = "[%(asctime)s] [%(threadName)s] [%(name)s.%(funcName)s:%(lineno)s] [%(levelname)s]: %(message)s"
+# Format used above the DEBUG level, leaves out the thread and caller info to keep formatting each record cheap
+LOG_FORMAT_BRIEF = "[%(asctime)s] [%(name)s] [%(levelname)s]: %(message)s"
 
 
-def setup_logger(name=None, level="DEBUG"):
+def setup_logger(name=None, level="DEBUG", log_format=None):
     logger = logging.getLogger(name)
     logger.setLevel(level)
-    formatter = logging.Formatter(LOG_FORMAT)
+    if log_format is None:
+        log_format = LOG_FORMAT if logger.level <= logging.DEBUG else LOG_FORMAT_BRIEF
+    formatter = logging.Formatter(log_format)
     stream_handler = logging.StreamHandler(sys.stderr)
     stream_handler.setFormatter(formatter)
     logger.addHandler(stream_handler)
@@ -31,12 +35,17 @@ def repr_format(obj, *args, **kwargs):
     :param kwargs: Other keyword args to populate with
     :return: String which represents the object
     """
-    items = args + tuple(kwargs.items())
-    inner = ", ".join("{}={!r}".format(k, v) for k, v in items)
-    return "{}({})".format(obj.__class__.__name__, inner)
+    if kwargs:
+        args += tuple(kwargs.items())
+    # str.join() builds a list from a generator anyway, a list comprehension skips the generator overhead
+    inner = ", ".join([f"{k}={v!r}" for k, v in args])
+    return f"{obj.__class__.__name__}({inner})"
 
 
 class Stopwatch:
+    # Times are stored as integer nanoseconds from perf_counter_ns() and only converted to seconds when read
+    _NS_PER_SECOND = 1_000_000_000
+
     def __init__(self):
         self._t_start = 0
         self._t_stop = 0
@@ -45,19 +54,19 @@ class Stopwatch:
         self._started = False
 
     def start(self):
-        self._t_start = time.perf_counter()
+        self._t_start = time.perf_counter_ns()
         self._t_stop = 0
         self._started = True
         self._is_running = True
 
     def stop(self):
         if self._is_running:
-            self._t_stop = time.perf_counter()
+            self._t_stop = time.perf_counter_ns()
             self._is_running = False
 
     def mark(self):
         if self._is_running:
-            self._t_mark = time.perf_counter()
+            self._t_mark = time.perf_counter_ns()
 
     @property
     def is_running(self):
@@ -65,22 +74,26 @@ class Stopwatch:
 
     @property
     def start_time(self):
-        return self._t_start
+        return self._t_start / self._NS_PER_SECOND
 
     @property
     def stop_time(self):
-        return self._t_stop
+        return self._t_stop / self._NS_PER_SECOND
 
     @property
-    def elapsed(self):
+    def elapsed_ns(self):
         if not self._started:
             raise RuntimeError("Timer was never started")
         if self._is_running:
             if self._t_mark == 0:
-                return time.perf_counter() - self._t_start
+                return time.perf_counter_ns() - self._t_start
             return self._t_mark - self._t_start
         return self._t_stop - self._t_start
 
+    @property
+    def elapsed(self):
+        return self.elapsed_ns / self._NS_PER_SECOND
+
     def __enter__(self):
         self.start()
         return self
@@ -95,8 +108,8 @@ class SynchronousMonotonicCounter:
     Utility class which implements a thread-safe monotonic counter
     """
     def __init__(self, start_value=0):
-        self._lock = threading.Lock()
-        self._counter = start_value
+        # itertools.count increments atomically in C, no separate lock is needed
+        self._counter = itertools.count(start_value)
 
     def __iter__(self):
         return self
@@ -105,21 +118,13 @@ class SynchronousMonotonicCounter:
         return self.next()
 
     def next(self):
-        with self._lock:
-            value = self._counter
-            self._counter += 1
-        return value
+        return next(self._counter)
 
 
 def snake_case_to_capitalized_words(string: str):
-    parts = [p for p in string.split("_") if p]
-    words = []
-    for p in parts:
-        if len(p) == 1:
-            words.append(p.upper())
-        else:
-            words.append(p[0].upper() + p[1:])
-    return " ".join(words)
+    # Only the first character of each word is capitalized. str.title() isn't used as it also changes the rest
+    # of the word, e.g. "utf8s" -> "Utf8S"
+    return " ".join(p[0].upper() + p[1:] for p in string.split("_") if p)
 
 
 class IntEnumWithDescription(int, enum.Enum):
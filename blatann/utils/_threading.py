@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import threading
+import types
 
 
 def _or(self, other):
@@ -41,29 +42,32 @@ class _OrEvent(threading.Event):
             self.add(e)
 
     def _changed(self):
-        bools = [e.is_set() for e in self.events]
-        if any(bools):
-            self.set()
-        else:
-            self.clear()
+        now_set = any(e.is_set() for e in self.events)
+        # Only update on an edge, no need to take the condition lock if the aggregate state didn't change
+        if now_set != self.is_set():
+            if now_set:
+                self.set()
+            else:
+                self.clear()
 
     def _orify(self, e):
         if not hasattr(e, "_set"):
             e._set = e.set
             e._clear = e.clear
             e._changed = []
-            e.set = lambda: _or_set(e)
-            e.clear = lambda: _or_clear(e)
-        e._changed.append(self._changed)
+            # Bind the replacements to the event directly rather than wrapping them in closures
+            e.set = types.MethodType(_or_set, e)
+            e.clear = types.MethodType(_or_clear, e)
+        if self._changed not in e._changed:
+            e._changed.append(self._changed)
 
     def add(self, event):
-        if isinstance(event, _OrEvent):
-            for e in event.events:
+        events = event.events if isinstance(event, _OrEvent) else [event]
+        for e in events:
+            # The same event can be OR'd in more than once (e.g. (a | b) | (a | c)), only track it once
+            if e not in self.events:
                 self._orify(e)
-            self.events.extend(event.events)
-        else:
-            self._orify(event)
-            self.events.append(event)
+                self.events.append(e)
 
     def __or__(self, other):
         return _or(self, other)
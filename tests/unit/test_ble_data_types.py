@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import struct
+import unittest
+from enum import IntEnum
+
+from blatann.services import ble_data_types
+from blatann.services.current_time.data_types import AdjustmentReason, AdjustmentReasonType
+from blatann.services.glucose.data_types import SensorStatus, SensorStatusType
+
+
+class TestIntegerTypes(unittest.TestCase):
+    # (type, min value, max value) of each fixed-width integer type
+    INT_TYPES = [
+        (ble_data_types.Int8, -2**7, 2**7 - 1),
+        (ble_data_types.Uint8, 0, 2**8 - 1),
+        (ble_data_types.Int16, -2**15, 2**15 - 1),
+        (ble_data_types.Uint16, 0, 2**16 - 1),
+        (ble_data_types.Uint24, 0, 2**24 - 1),
+        (ble_data_types.Uint32, 0, 2**32 - 1),
+        (ble_data_types.Int32, -2**31, 2**31 - 1),
+        (ble_data_types.Uint40, 0, 2**40 - 1),
+        (ble_data_types.Uint48, 0, 2**48 - 1),
+        (ble_data_types.Uint56, 0, 2**56 - 1),
+        (ble_data_types.Uint64, 0, 2**64 - 1),
+        (ble_data_types.Int64, -2**63, 2**63 - 1),
+    ]
+
+    def test_round_trip(self):
+        for int_type, min_value, max_value in self.INT_TYPES:
+            for value in (min_value, 0, 1, 0x5A, max_value):
+                with self.subTest(int_type=int_type.__name__, value=value):
+                    encoded = int_type.encode(value)
+                    self.assertEqual(value.to_bytes(int_type.byte_count, "little", signed=int_type.signed), encoded)
+
+                    # Trailing data in the stream should be left alone
+                    stream = ble_data_types.BleDataStream(encoded + b"\xAA")
+                    self.assertEqual(value, int_type.decode(stream))
+                    self.assertEqual(int_type.byte_count, stream.decode_index)
+
+    def test_decode_sequential_values(self):
+        stream = ble_data_types.BleDataStream()
+        stream.encode_multiple([ble_data_types.Uint8, 0x12], [ble_data_types.Uint24, 0x345678],
+                               [ble_data_types.Int16, -2], [ble_data_types.Uint40, 0x9ABCDEF012])
+        self.assertEqual(b"\x12\x78\x56\x34\xFE\xFF\x12\xF0\xDE\xBC\x9A", stream.value)
+
+        values = stream.decode_multiple(ble_data_types.Uint8, ble_data_types.Uint24,
+                                        ble_data_types.Int16, ble_data_types.Uint40)
+        self.assertEqual([0x12, 0x345678, -2, 0x9ABCDEF012], list(values))
+        self.assertEqual(len(stream.value), stream.decode_index)
+
+    def test_decode_short_stream_raises_struct_error(self):
+        for int_type, _, _ in self.INT_TYPES:
+            with self.subTest(int_type=int_type.__name__):
+                stream = ble_data_types.BleDataStream(b"\x01" * (int_type.byte_count - 1))
+                with self.assertRaises(struct.error):
+                    int_type.decode(stream)
+
+    def test_padded_types_truncate_values_within_struct_size(self):
+        # Types without a native struct size pack the next size up and keep the low bytes
+        self.assertEqual(b"\x05\x00\x00", ble_data_types.Uint24.encode(2**24 + 5))
+        self.assertEqual(b"\x03\x00\x00\x00\x00", ble_data_types.Uint40.encode(2**40 + 3))
+
+    def test_invalid_values_raise_struct_error(self):
+        invalid_values = [
+            (ble_data_types.Uint8, 256),
+            (ble_data_types.Uint16, -1),
+            (ble_data_types.Uint24, -1),
+            (ble_data_types.Uint24, 2**32),
+            (ble_data_types.Uint40, 2**64),
+            (ble_data_types.Uint56, -128),
+            (ble_data_types.Int16, 2**15),
+        ]
+        for int_type, _, _ in self.INT_TYPES:
+            invalid_values.extend((int_type, v) for v in (1.5, "3", None))
+
+        for int_type, value in invalid_values:
+            with self.subTest(int_type=int_type.__name__, value=value):
+                with self.assertRaises(struct.error):
+                    int_type.encode(value)
+
+
+class TestBitfield(unittest.TestCase):
+    def test_init_sets_only_given_flags(self):
+        status = SensorStatus(SensorStatusType.battery_low, SensorStatusType.time_fault, SensorStatusType.battery_low)
+        for status_type in SensorStatusType:
+            with self.subTest(status_type=status_type.name):
+                expected = status_type in (SensorStatusType.battery_low, SensorStatusType.time_fault)
+                self.assertIs(expected, getattr(status, status_type.name))
+
+    def test_encode(self):
+        status = SensorStatus(SensorStatusType.battery_low, SensorStatusType.result_below_range,
+                              SensorStatusType.time_fault)
+        self.assertEqual(0x0841, status.to_integer_value())
+        self.assertEqual(b"\x41\x08", status.encode_bytes())
+        self.assertEqual(b"\x41\x08", status.encode().value)
+        self.assertEqual(b"\x00\x00", SensorStatus().encode_bytes())
+
+        reason = AdjustmentReason(AdjustmentReasonType.time_zone_change, AdjustmentReasonType.dst_change)
+        self.assertEqual(b"\x0C", reason.encode_bytes())
+
+    def test_round_trip(self):
+        for value in range(1 << len(SensorStatusType)):
+            with self.subTest(value=value):
+                encoded = SensorStatus.from_integer_value(value).encode_bytes()
+                decoded = SensorStatus.decode(ble_data_types.BleDataStream(encoded))
+                self.assertEqual(value, decoded.to_integer_value())
+                for status_type in SensorStatusType:
+                    self.assertEqual(bool(value & (1 << status_type)), getattr(decoded, status_type.name))
+
+    def test_decode_ignores_undefined_bits(self):
+        decoded = AdjustmentReason.decode(ble_data_types.BleDataStream(b"\xF1"))
+        self.assertTrue(decoded.manual_time_update)
+        self.assertFalse(decoded.dst_change)
+        self.assertEqual(0x01, decoded.to_integer_value())
+
+    def test_subclass_init_not_overridden(self):
+        class _Bits(IntEnum):
+            a = 0
+            b = 3
+
+        class _CustomBitfield(ble_data_types.Bitfield):
+            bitfield_enum = _Bits
+
+            def __init__(self, a):
+                super(_CustomBitfield, self).__init__()
+                self.a = a
+
+        bitfield = _CustomBitfield(True)
+        self.assertTrue(bitfield.a)
+        self.assertFalse(bitfield.b)
+        self.assertEqual(b"\x01", bitfield.encode_bytes())
+
+
+if __name__ == '__main__':
+    unittest.main()
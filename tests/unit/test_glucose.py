@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+import datetime
+import itertools
+import unittest
+
+from blatann.exceptions import DecodeError
+from blatann.services import ble_data_types
+from blatann.services.glucose.data_types import (
+    CarbohydrateType, CarbsInfo, ExerciseInfo, GlucoseConcentrationUnits, GlucoseContext, GlucoseMeasurement,
+    GlucoseSample, GlucoseType, HealthStatus, MealType, MedicationInfo, MedicationType, MedicationUnits, SampleLocation,
+    SensorStatus, SensorStatusType, TesterType
+)
+from blatann.services.glucose.database import BasicGlucoseDatabase
+from blatann.services.glucose.racp import (
+    FilterType, RacpCommand, RacpOpcode, RacpOperator, RacpResponse, RacpResponseCode
+)
+
+MEASUREMENT_TIME = datetime.datetime(2021, 3, 4, 5, 6, 7)
+
+
+def _stream(data):
+    return ble_data_types.BleDataStream(data)
+
+
+class TestGlucoseMeasurement(unittest.TestCase):
+    def test_encode_mandatory_fields(self):
+        measurement = GlucoseMeasurement(42, MEASUREMENT_TIME)
+        self.assertEqual(bytes.fromhex("002a00e5070304050607"), measurement.encode_bytes())
+        self.assertEqual(measurement.encode_bytes(), measurement.encode().value)
+
+    def test_encode_all_fields(self):
+        sample = GlucoseSample(GlucoseType.capillary_plasma, SampleLocation.finger, 5.5)
+        status = SensorStatus(SensorStatusType.battery_low, SensorStatusType.result_below_range,
+                              SensorStatusType.time_fault)
+        measurement = GlucoseMeasurement(42, MEASUREMENT_TIME, -30, sample, status, GlucoseContext(42))
+        self.assertEqual(bytes.fromhex("1b2a00e5070304050607e2ff37f0214108"), measurement.encode_bytes())
+
+    def test_decode_all_fields(self):
+        measurement = GlucoseMeasurement.decode(_stream(bytes.fromhex("1f2a00e5070304050607e2ff37f0214108")))
+        self.assertEqual(42, measurement.sequence_number)
+        self.assertEqual(MEASUREMENT_TIME, measurement.measurement_time)
+        self.assertEqual(-30, measurement.time_offset_minutes)
+        self.assertEqual(GlucoseType.capillary_plasma, measurement.sample.type)
+        self.assertEqual(SampleLocation.finger, measurement.sample.sample_location)
+        self.assertEqual(5.5, measurement.sample.value)
+        self.assertEqual(GlucoseConcentrationUnits.mol_per_liter, measurement.sample.units)
+        self.assertEqual(0x0841, measurement.sensor_status.to_integer_value())
+        # The context is sent separately, decoding only reports whether one follows
+        self.assertTrue(measurement.context)
+
+    def test_round_trip(self):
+        samples = [
+            None,
+            GlucoseSample(GlucoseType.capillary_plasma, SampleLocation.finger, 5.5),
+            GlucoseSample(GlucoseType.venous_plasma, SampleLocation.unknown, 0.0123,
+                          GlucoseConcentrationUnits.mol_per_liter),
+        ]
+        statuses = [None, SensorStatus(), SensorStatus(SensorStatusType.sensor_temp_high)]
+        contexts = [None, GlucoseContext(7)]
+        for time_offset, sample, status, context in itertools.product([None, -30, 15], samples, statuses, contexts):
+            measurement = GlucoseMeasurement(7, MEASUREMENT_TIME, time_offset, sample, status, context)
+            with self.subTest(measurement=measurement):
+                encoded = measurement.encode_bytes()
+                stream = _stream(encoded)
+                decoded = GlucoseMeasurement.decode(stream)
+                self.assertEqual(len(encoded), stream.decode_index)
+                self.assertEqual(time_offset, decoded.time_offset_minutes)
+                self.assertEqual(context is not None, decoded.context)
+                # Decoding only reports whether a context follows, put the original back to compare the encoding
+                decoded.context = context
+                self.assertEqual(encoded, decoded.encode_bytes())
+                if sample is None:
+                    self.assertIsNone(decoded.sample)
+                else:
+                    self.assertEqual(sample.units, decoded.sample.units)
+
+
+class TestGlucoseContext(unittest.TestCase):
+    def test_encode_mandatory_fields(self):
+        self.assertEqual(bytes.fromhex("000300"), GlucoseContext(3).encode_bytes())
+
+    def test_encode_all_fields(self):
+        context = GlucoseContext(4, CarbsInfo(12.5, CarbohydrateType.lunch), MealType.fasting, TesterType.self,
+                                 HealthStatus.normal, ExerciseInfo(1200, 50),
+                                 MedicationInfo(MedicationType.long_acting_insulin, 0.5, MedicationUnits.milliliters),
+                                 6.5, 3)
+        self.assertEqual(bytes.fromhex("ff040003027df00315b004320405f041f0"), context.encode_bytes())
+        self.assertEqual(context.encode_bytes(), context.encode().value)
+
+    def test_round_trip(self):
+        context = GlucoseContext(7, meal_type=MealType.postprandial, tester=TesterType.lab_test,
+                                 health_status=HealthStatus.under_stress, exercise=ExerciseInfo(600, 25),
+                                 medication=MedicationInfo(MedicationType.rapid_acting_insulin, 12,
+                                                           MedicationUnits.milliliters),
+                                 hba1c_percent=6.5, extra_flags=1)
+        encoded = context.encode_bytes()
+        stream = _stream(encoded)
+        decoded = GlucoseContext.decode(stream)
+        self.assertEqual(len(encoded), stream.decode_index)
+        self.assertEqual(encoded, decoded.encode_bytes())
+        self.assertEqual(7, decoded.sequence_number)
+        self.assertEqual(MealType.postprandial, decoded.meal_type)
+        self.assertEqual(TesterType.lab_test, decoded.tester)
+        self.assertEqual(HealthStatus.under_stress, decoded.health_status)
+        self.assertEqual(600, decoded.exercise.duration_seconds)
+        self.assertEqual(25, decoded.exercise.intensity_percent)
+        self.assertEqual(MedicationType.rapid_acting_insulin, decoded.medication.type)
+        self.assertEqual(12, decoded.medication.value)
+        self.assertEqual(MedicationUnits.milliliters, decoded.medication.units)
+        self.assertEqual(6.5, decoded.hba1c_percent)
+        self.assertEqual(1, decoded.extra_flags)
+
+
+class TestRacp(unittest.TestCase):
+    def test_command_round_trip(self):
+        commands = [
+            (RacpCommand(RacpOpcode.report_stored_records, RacpOperator.all_records), "0101", (None, None)),
+            (RacpCommand(RacpOpcode.report_stored_records, RacpOperator.within_range_inclusive,
+                         FilterType.sequence_number, [3, 10]), "01040103000a00", (3, 10)),
+            (RacpCommand(RacpOpcode.delete_stored_records, RacpOperator.less_than_or_equal_to,
+                         FilterType.sequence_number, [7]), "0202010700", (None, 7)),
+            (RacpCommand(RacpOpcode.report_number_of_records, RacpOperator.greater_than_or_equal_to,
+                         FilterType.sequence_number, [7]), "0403010700", (7, None)),
+            (RacpCommand(RacpOpcode.report_stored_records, RacpOperator.first_record), "0105", (None, None)),
+            (RacpCommand(RacpOpcode.report_stored_records, RacpOperator.last_record), "0106", (None, None)),
+        ]
+        for command, expected_hex, expected_min_max in commands:
+            with self.subTest(expected=expected_hex):
+                encoded = command.encode_bytes()
+                self.assertEqual(bytes.fromhex(expected_hex), encoded)
+                self.assertEqual(expected_min_max, command.get_filter_min_max())
+
+                decoded = RacpCommand.decode(_stream(encoded))
+                self.assertEqual(command.opcode, decoded.opcode)
+                self.assertEqual(command.operator, decoded.operator)
+                self.assertEqual(command.filter_type, decoded.filter_type)
+                self.assertEqual(command.filter_params, decoded.filter_params)
+                self.assertEqual(expected_min_max, decoded.get_filter_min_max())
+
+    def test_filter_min_max_follows_modified_command(self):
+        command = RacpCommand(RacpOpcode.report_stored_records, RacpOperator.within_range_inclusive,
+                              FilterType.sequence_number, [3, 10])
+        self.assertEqual((3, 10), command.get_filter_min_max())
+        command.filter_params = [4, 5]
+        self.assertEqual((4, 5), command.get_filter_min_max())
+        command.operator = RacpOperator.greater_than_or_equal_to
+        self.assertEqual((4, None), command.get_filter_min_max())
+
+    def test_filter_min_max_missing_params(self):
+        command = RacpCommand.decode(_stream(bytes.fromhex("0104010300")))
+        with self.assertRaises(DecodeError):
+            command.get_filter_min_max()
+
+    def test_response_round_trip(self):
+        response = RacpResponse(RacpOpcode.report_stored_records, RacpResponseCode.no_records_found)
+        encoded = response.encode_bytes()
+        self.assertEqual(bytes.fromhex("06000106"), encoded)
+        decoded = RacpResponse.decode(_stream(encoded))
+        self.assertEqual(RacpOpcode.report_stored_records, decoded.request_code)
+        self.assertEqual(RacpResponseCode.no_records_found, decoded.response_code)
+        self.assertIsNone(decoded.record_count)
+
+        response = RacpResponse(record_count=513)
+        encoded = response.encode_bytes()
+        self.assertEqual(bytes.fromhex("05000102"), encoded)
+        decoded = RacpResponse.decode(_stream(encoded))
+        self.assertEqual(513, decoded.record_count)
+
+
+class TestBasicGlucoseDatabase(unittest.TestCase):
+    SEQUENCE_NUMBERS = [2, 4, 6, 8, 10]
+
+    # (min, max) ranges and the sequence numbers within them
+    RANGES = [
+        (None, None, [2, 4, 6, 8, 10]),
+        (4, 8, [4, 6, 8]),
+        (3, 7, [4, 6]),
+        (6, 6, [6]),
+        (5, 5, []),
+        (None, 2, [2]),
+        (None, 1, []),
+        (10, None, [10]),
+        (11, None, []),
+        (0, 100, [2, 4, 6, 8, 10]),
+        (8, 4, []),
+    ]
+
+    def setUp(self):
+        # Deliberately out of order, the database sorts them
+        records = [GlucoseMeasurement(s, MEASUREMENT_TIME) for s in reversed(self.SEQUENCE_NUMBERS)]
+        self.database = BasicGlucoseDatabase(records)
+
+    def _seq_numbers(self, records):
+        return [r.sequence_number for r in records]
+
+    def test_record_count(self):
+        for min_seq, max_seq, expected in self.RANGES:
+            with self.subTest(min_seq=min_seq, max_seq=max_seq):
+                self.assertEqual(len(expected), self.database.record_count(min_seq, max_seq))
+
+    def test_get_records(self):
+        for min_seq, max_seq, expected in self.RANGES:
+            with self.subTest(min_seq=min_seq, max_seq=max_seq):
+                self.assertEqual(expected, self._seq_numbers(self.database.get_records(min_seq, max_seq)))
+
+    def test_delete_records(self):
+        for min_seq, max_seq, expected in self.RANGES:
+            with self.subTest(min_seq=min_seq, max_seq=max_seq):
+                self.setUp()
+                self.assertEqual(RacpResponseCode.success, self.database.delete_records(min_seq, max_seq))
+                remaining = [s for s in self.SEQUENCE_NUMBERS if s not in expected]
+                self.assertEqual(remaining, self._seq_numbers(self.database.get_records()))
+                self.assertEqual(len(remaining), self.database.record_count())
+
+    def test_first_and_last_record(self):
+        self.assertEqual(2, self.database.first_record().sequence_number)
+        self.assertEqual(10, self.database.last_record().sequence_number)
+        self.database.delete_records()
+        self.assertIsNone(self.database.first_record())
+        self.assertIsNone(self.database.last_record())
+        self.assertEqual(0, self.database.record_count())
+        self.assertEqual([], self._seq_numbers(self.database.get_records()))
+
+    def test_add_record(self):
+        for seq_num in [5, 1, 12]:
+            self.database.add_record(GlucoseMeasurement(seq_num, MEASUREMENT_TIME))
+        self.assertEqual([1, 2, 4, 5, 6, 8, 10, 12], self._seq_numbers(self.database.get_records()))
+        self.assertEqual([4, 5, 6], self._seq_numbers(self.database.get_records(3, 7)))
+        self.assertEqual(12, self.database.last_record().sequence_number)
+
+        with self.assertRaises(ValueError):
+            self.database.add_record(GlucoseMeasurement(6, MEASUREMENT_TIME))
+        self.assertEqual(8, self.database.record_count())
+
+
+if __name__ == '__main__':
+    unittest.main()